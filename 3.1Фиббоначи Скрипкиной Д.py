@@ -6,9 +6,17 @@
 # функция вызывает саму себя для двух предыдущих членов,
 # суммирует их значения и возвращает результат для текущего индекса n.
 # В процессе рекурсии #значения вычисляются для каждого уровня, пока не достигнут базовые случаи.
+# Без запоминания рекурсия вычисляет одни и те же члены много раз (время растет экспоненциально),
+# поэтому уже вычисленные значения сохраняются в кэше lru_cache.
+# Для больших n есть функция fibonacci_fast, работающая за O(log n) умножений (метод быстрого удвоения),
+# генератор fibonacci_range для вывода подряд идущих членов и функция fibonacci_str для записи больших членов.
+import sys
+from functools import lru_cache
 
 
 # Функция fibonacci_recursive принимает целое число n и возвращает n-е число в последовательности Фибоначчи.
+# Глубина рекурсии ограничена (примерно 1000 уровней), поэтому для больших n нужна fibonacci_fast.
+@lru_cache(maxsize=None)
 def fibonacci_recursive(n):
     # Проверка, что введенное число больше 0.
     if n <= 0:
@@ -24,6 +32,54 @@ def fibonacci_recursive(n):
         return fibonacci_recursive(n - 1) + fibonacci_recursive(n - 2)
 
 
-print("Введите n - номер члена последовательности Фибоначчи: ")
-n = int(input())
-print(f"{n}-й член последовательности Фибоначчи: {fibonacci_recursive(n)}")
+# Метод быстрого удвоения: по паре (F(k), F(k+1)) сразу получаем (F(2k), F(2k+1)):
+# F(2k) = F(k) * (2*F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2.
+# Проходя по битам номера от старшего к младшему, получаем ответ за O(log n) шагов.
+def _fibonacci_pair(k):
+    a, b = 0, 1  # F(0), F(1) в обычной нумерации с нуля
+    for bit in bin(k)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == '1':
+            a, b = b, a + b
+    return a, b
+
+
+# Функция fibonacci_fast возвращает n-е число Фибоначчи с той же нумерацией, что и fibonacci_recursive
+# (1-й член равен 0, 2-й равен 1), но работает и для n порядка миллионов.
+def fibonacci_fast(n):
+    if n <= 0:
+        return "Введите число n больше нуля"
+    return _fibonacci_pair(n - 1)[0]
+
+
+# Генератор fibonacci_range выдает члены последовательности с номерами от start до stop включительно.
+# Первый член вычисляется быстрым удвоением, остальные - сложением двух предыдущих.
+def fibonacci_range(start, stop):
+    start = max(start, 1)
+    if start > stop:
+        return
+    a, b = _fibonacci_pair(start - 1)
+    for _ in range(start, stop + 1):
+        yield a
+        a, b = b, a + b
+
+
+# Функция fibonacci_str возвращает n-е число Фибоначчи в виде строки десятичных цифр.
+# Начиная с Python 3.11 по умолчанию нельзя переводить в строку числа длиннее 4300 цифр,
+# поэтому ограничение снимается только на время перевода и затем восстанавливается.
+def fibonacci_str(n):
+    value = fibonacci_fast(n)
+    if not hasattr(sys, "set_int_max_str_digits"):
+        return str(value)
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        return str(value)
+    finally:
+        sys.set_int_max_str_digits(limit)
+
+
+if __name__ == "__main__":
+    print("Введите n - номер члена последовательности Фибоначчи: ")
+    n = int(input())
+    print(f"{n}-й член последовательности Фибоначчи: {fibonacci_recursive(n)}")
@@ -1,5 +1,16 @@
+import gc
+import heapq
+import itertools
+import json
 import math
+import mmap
+import multiprocessing
+import operator
+import struct
+import time
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
 class Location:
     """
     Класс Location представляет собой местоположение с определенными габаритами (ширина, высота, длина).
@@ -7,9 +18,13 @@ class Location:
 
     Методы класса позволяют добавлять объекты, проверять, находятся ли координаты внутри границ местоположения,
     а также получать информацию о его размерах.
+
+    Объекты дополнительно хранятся в равномерной сетке (пространственном индексе): пространство делится
+    на кубические ячейки, и запросы "кто находится в радиусе R" просматривают только соседние ячейки,
+    а не все объекты местоположения.
     """
 
-    def __init__(self, name: str, width: int, height: int, length: int):
+    def __init__(self, name: str, width: int, height: int, length: int, cell_size: int = 10):
         """
         Инициализация нового объекта Location.
 
@@ -18,26 +33,447 @@ class Location:
         - width: int - Ширина местоположения.
         - height: int - Высота местоположения.
         - length: int - Длина местоположения.
+        - cell_size: int - Размер ячейки пространственного индекса.
         """
         self.name = name  # Имя местоположения
         self._width = width  # Ширина
         self._height = height  # Высота
         self._length = length  # Длина
         self._objs = []  # Список объектов в данном местоположении
+        self._cell_size = cell_size  # Размер ячейки сетки
+        self._grid = {}  # Ячейка сетки -> множество объектов в ней
+        self._cells = {}  # Объект -> ячейка сетки, в которой он находится
+        self._store = None  # Колоночное хранилище сущностей (EntityStore), включается через useStore
+        self._world = None  # Мир (World), который продвигает время в данном местоположении
+        self._tracker = None  # Отслеживание изменений (ChangeTracker), включается через trackChanges
 
     def addObject(self, obj):
         """
-        Добавляет объект в список объектов местоположения.
+        Добавляет объект в список объектов местоположения и в пространственный индекс.
 
         Параметры:
         - obj: GameObject - Объект, который добавляется в местоположение.
         """
-        if obj not in self._objs:
+        if obj not in self._cells:
             self._objs.append(obj)
+            cell = self._cellOf(obj.x, obj.y, obj.z)
+            self._cells[obj] = cell
+            self._grid.setdefault(cell, set()).add(obj)
+            if self._store is not None:
+                self._store.add(obj)
+            if self._tracker is not None:
+                self._tracker.added(obj)
+
+    def removeObject(self, obj):
+        """
+        Удаляет объект из местоположения, его пространственного индекса и хранилища сущностей.
+
+        Параметры:
+        - obj: GameObject - Объект, который удаляется из местоположения.
+        """
+        cell = self._cells.pop(obj, None)
+        if cell is None:
+            return
+        self._objs.remove(obj)
+        bucket = self._grid[cell]
+        bucket.discard(obj)
+        if not bucket:
+            del self._grid[cell]
+        if self._store is not None:
+            self._store.remove(obj)
+        if self._world is not None:
+            self._world._bleeding.discard(obj)  # Запланированный урон для удаленного объекта не сработает
+        if self._tracker is not None:
+            self._tracker.removed(obj)
+
+    def trackChanges(self):
+        """
+        Включает отслеживание изменений объектов местоположения для передачи их копиям (репликам).
+
+        Возвращает:
+        - ChangeTracker - Объект, накапливающий изменения.
+        """
+        if self._tracker is None:
+            self._tracker = ChangeTracker(self)
+        return self._tracker
+
+    def markDirty(self, obj, field: str):
+        """
+        Отмечает, что поле field объекта obj изменилось (если отслеживание изменений включено).
+
+        Параметры:
+        - obj: GameObject - Изменившийся объект.
+        - field: str - Имя изменившегося поля.
+        """
+        if self._tracker is not None:
+            self._tracker.mark(obj, field)
+
+    def __getstate__(self):
+        """Мир не сохраняется вместе с местоположением: при передаче в другой процесс оно попадает в новый мир."""
+        state = self.__dict__.copy()
+        state['_world'] = None
+        state['_tracker'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Восстанавливает местоположение и заново связывает с ним его объекты."""
+        self.__dict__.update(state)
+        for obj in self._objs or ():
+            obj._loc = self
+
+    def useStore(self):
+        """
+        Включает колоночное хранилище сущностей для данного местоположения.
+        Координаты, здоровье и кровотечение всех объектов переносятся в общие массивы,
+        а сами объекты становятся тонкими представлениями над ними.
+
+        Возвращает:
+        - EntityStore - Хранилище сущностей местоположения.
+        """
+        if self._store is None:
+            self._store = EntityStore(self)
+            for obj in self._objs:
+                self._store.add(obj)
+        return self._store
+
+    def saveSnapshot(self, path):
+        """
+        Сохраняет местоположение и все его объекты в компактный двоичный файл.
+
+        Числовые поля всех объектов (координаты, здоровье, кровотечение, урон, радиус, флаги)
+        записываются колонками в типизированные массивы, имена - одним блоком UTF-8,
+        а инвентарь - номерами объектов в списке объектов местоположения.
+        Класс объекта записывается номером в таблице классов снимка (модуль и полное имя класса),
+        поэтому подклассы восстанавливаются со своим типом.
+
+        Параметры:
+        - path: str - Путь к файлу снимка.
+        """
+        objs = self._objs
+        n = len(objs)
+        index = {obj: i for i, obj in enumerate(objs)}
+        classes = {}
+        kinds = array('H')
+        x, y, z = array('d'), array('d'), array('d')
+        hp, max_hp, bleeding = array('d'), array('d'), array('d')
+        damage, radius, bleeding_damage = array('d'), array('d'), array('d')
+        flags = array('B')
+        names, name_offsets = [], array('q', [0])
+        inventory, inventory_offsets = array('q'), array('q', [0])
+        for obj in objs:
+            if not isinstance(obj, GameObject):
+                raise TypeError(f"Объект {obj!r} типа {type(obj).__name__} нельзя сохранить в снимок")
+            kinds.append(classes.setdefault(type(obj), len(classes)))
+            x.append(obj.x)
+            y.append(obj.y)
+            z.append(obj.z)
+            if isinstance(obj, LivingObject):
+                hp.append(obj.hp)
+                max_hp.append(obj.maxHP)
+                bleeding.append(obj.bleeding)
+                inventory.extend(index[item] for item in obj.inventory if item in index)
+            else:
+                hp.append(obj._hp if isinstance(obj, Eatable) else 0)  # Для еды - восстанавливаемое здоровье
+                max_hp.append(0)
+                bleeding.append(0)
+            if isinstance(obj, Weapon):
+                damage.append(obj.damage)
+                radius.append(obj.radius)
+                bleeding_damage.append(obj.bleeding_damage if isinstance(obj, ColdWeapon) else 0)
+            else:
+                damage.append(0)
+                radius.append(0)
+                bleeding_damage.append(0)
+            flags.append((isinstance(obj, Eatable) and obj.eaten) | (isinstance(obj, Burnable) and obj.burned) << 1)
+            names.append(obj.name)
+            name_offsets.append(name_offsets[-1] + len(obj.name))  # Смещения в символах, а не в байтах
+            inventory_offsets.append(len(inventory))
+
+        name = self.name.encode('utf-8')
+        names = ''.join(names).encode('utf-8')
+        class_names = '\n'.join(f'{kind.__module__}:{kind.__qualname__}' for kind in classes).encode('utf-8')
+        header = struct.pack(_SNAPSHOT_HEADER, _SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, self._store is not None,
+                             n, len(name), self._width, self._height, self._length, self._cell_size,
+                             len(classes), len(class_names), len(names))
+        with open(path, 'wb') as f:
+            for part in (header, name, class_names, kinds, x, y, z, hp, max_hp, bleeding, damage, radius,
+                         bleeding_damage, flags, name_offsets, names, inventory_offsets, inventory):
+                data = bytes(part)
+                f.write(data)
+                f.write(bytes(-len(data) % 8))  # Выравнивание по 8 байт, чтобы колонки можно было отобразить в память
+
+    @classmethod
+    def loadSnapshot(cls, path):
+        """
+        Восстанавливает местоположение и его объекты из файла, созданного saveSnapshot.
+        Файл отображается в память (mmap), и каждая колонка копируется из него в массив одной операцией.
+        Объекты создаются и заполняются группами по классам цепочками map, без цикла на Python,
+        а если в снимке включен EntityStore, прочитанные массивы сразу становятся колонками хранилища.
+
+        Параметры:
+        - path: str - Путь к файлу снимка.
+
+        Возвращает:
+        - Location - Восстановленное местоположение.
+        """
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version = struct.unpack_from('<4sH', mm, 0)
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError("Файл не является снимком местоположения")
+            if version != _SNAPSHOT_VERSION:
+                raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+            (_, _, use_store, n, name_len, width, height, length, cell_size,
+             class_count, class_names_len, names_len) = struct.unpack_from(_SNAPSHOT_HEADER, mm, 0)
+            view = memoryview(mm)
+            pos = struct.calcsize(_SNAPSHOT_HEADER)
+
+            def take(count, fmt):
+                nonlocal pos
+                column = array(fmt)
+                size = count * column.itemsize
+                column.frombytes(view[pos:pos + size])
+                pos += size + (-size % 8)
+                return column
+
+            name = take(name_len, 'B').tobytes().decode('utf-8')
+            class_names = take(class_names_len, 'B').tobytes().decode('utf-8')
+            classes = [_snapshotClass(entry) for entry in class_names.split('\n')] if class_count else []
+            kinds = take(n, 'H')
+            x, y, z = take(n, 'd'), take(n, 'd'), take(n, 'd')
+            hp, max_hp, bleeding = take(n, 'd'), take(n, 'd'), take(n, 'd')
+            damage, radius, bleeding_damage = take(n, 'd'), take(n, 'd'), take(n, 'd')
+            flags = take(n, 'B')
+            name_offsets = take(n + 1, 'q')
+            names = take(names_len, 'B').tobytes().decode('utf-8')
+            inventory_offsets = take(n + 1, 'q')
+            inventory = take(inventory_offsets[n], 'q')
+            view.release()
+
+        # Сборщик циклического мусора на время создания объектов выключается: иначе он многократно
+        # обходит все уже созданные объекты, а мусора здесь нет
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return cls._restoreSnapshot(name, width, height, length, cell_size, use_store, classes, kinds,
+                                        x, y, z, hp, max_hp, bleeding, damage, radius, bleeding_damage, flags,
+                                        name_offsets, names, inventory_offsets, inventory)
+        finally:
+            if collecting:
+                gc.enable()
+
+    @classmethod
+    def _restoreSnapshot(cls, name, width, height, length, cell_size, use_store, classes, kinds,
+                         x, y, z, hp, max_hp, bleeding, damage, radius, bleeding_damage, flags,
+                         name_offsets, names, inventory_offsets, inventory):
+        """Создает местоположение и его объекты по колонкам, прочитанным loadSnapshot."""
+        n = len(kinds)
+        loc = cls(name, width, height, length, _integral(cell_size))
+        objs = [None] * n
+        starts, ends = name_offsets[:-1], name_offsets[1:]
+        for number, kind in enumerate(classes):
+            rows = list(itertools.compress(range(n), map(operator.eq, kinds, itertools.repeat(number))))
+            # Конструктор не вызывается: атрибуты присваиваются всей группе сразу, по одной колонке
+            group = list(map(kind.__new__, itertools.repeat(kind, len(rows))))
+
+            def add(attribute, values):
+                """Присваивает атрибут всем объектам группы: значения берутся по порядку из values."""
+                deque(map(setattr, group, itertools.repeat(attribute), values), maxlen=0)
+
+            add('name', map(names.__getitem__, map(slice, map(starts.__getitem__, rows), map(ends.__getitem__, rows))))
+            add('_loc', itertools.repeat(loc))
+            if use_store:
+                add('_slot', rows)  # Строка хранилища совпадает с номером объекта в снимке
+            else:
+                for attribute, column in (('_x', x), ('_y', y), ('_z', z)):
+                    add(attribute, map(_integral, map(column.__getitem__, rows)))
+            if issubclass(kind, LivingObject) and not use_store:
+                for attribute, column in (('_hp', hp), ('_max_hp', max_hp), ('_bleeding', bleeding)):
+                    add(attribute, map(_integral, map(column.__getitem__, rows)))
+            if issubclass(kind, Weapon):
+                add('_damage', map(_integral, map(damage.__getitem__, rows)))
+                add('_radius', map(_integral, map(radius.__getitem__, rows)))
+            if issubclass(kind, ColdWeapon):
+                add('_bleeding_damage', map(_integral, map(bleeding_damage.__getitem__, rows)))
+            if issubclass(kind, Eatable):
+                add('_hp', map(_integral, map(hp.__getitem__, rows)))
+                add('_eaten', map(bool, map(operator.and_, map(flags.__getitem__, rows), itertools.repeat(1))))
+            if issubclass(kind, Burnable):
+                add('_burned', map(bool, map(operator.and_, map(flags.__getitem__, rows), itertools.repeat(2))))
+            deque(map(objs.__setitem__, rows, group), maxlen=0)
+
+        # Инвентарь: номера объектов заменяются самими объектами, а список каждого живого объекта - срез общего списка
+        items = list(map(objs.__getitem__, inventory))
+        living = array('b', map(issubclass, classes, itertools.repeat(LivingObject)))
+        living = array('b', map(living.__getitem__, kinds))
+        rows = list(itertools.compress(range(n), living))
+        deque(map(setattr, map(objs.__getitem__, rows), itertools.repeat('_inventory'),
+                  map(items.__getitem__, map(slice, map(inventory_offsets.__getitem__, rows),
+                                             map(inventory_offsets.__getitem__, map(operator.add, rows,
+                                                                                   itertools.repeat(1)))))),
+              maxlen=0)
+
+        # Пространственный индекс строится по колонкам координат, без вызова addObject для каждого объекта
+        size = loc._cell_size
+        cells = list(zip(*(map(int, map(operator.floordiv, column, itertools.repeat(size))) for column in (x, y, z))))
+        loc._objs = objs
+        loc._cells = dict(zip(objs, cells))
+        for obj, cell in zip(objs, cells):
+            loc._grid.setdefault(cell, set()).add(obj)
+
+        if use_store:
+            store = EntityStore(loc)
+            store._objs = list(objs)
+            store.x, store.y, store.z = x, y, z
+            store.hp = array('d', map(operator.mul, hp, living))  # У неживых объектов здоровье в хранилище равно 0
+            store.max_hp, store.bleeding, store.living = max_hp, bleeding, living
+            loc._store = store
+        return loc
+
+
+    @property
+    def store(self):
+        """Свойство, возвращающее колоночное хранилище сущностей (или None, если оно не включено)."""
+        return self._store
 
     def clear(self):
         """Очищает список объектов в местоположении."""
+        if self._store is not None:
+            for obj in list(self._store._objs):  # Поля возвращаются из хранилища в сами объекты
+                self._store.remove(obj)
         self._objs = None
+        self._grid = {}
+        self._cells = {}
+        self._store = None
+
+    def _cellOf(self, x, y, z):
+        """Возвращает ячейку сетки, в которую попадают координаты x, y, z."""
+        size = self._cell_size
+        return int(x // size), int(y // size), int(z // size)
+
+    def updateIndex(self, obj):
+        """
+        Переносит объект в нужную ячейку пространственного индекса после изменения его координат.
+        Вызывается из сеттеров координат GameObject.
+
+        Параметры:
+        - obj: GameObject - Объект, координаты которого изменились.
+        """
+        old = self._cells.get(obj)
+        if old is None:  # Объект еще не добавлен в местоположение
+            return
+        new = self._cellOf(obj.x, obj.y, obj.z)
+        if new == old:
+            return
+        bucket = self._grid[old]
+        bucket.discard(obj)
+        if not bucket:
+            del self._grid[old]
+        self._grid.setdefault(new, set()).add(obj)
+        self._cells[obj] = new
+
+    def _cellRange(self, center, r, dimension):
+        """Номера ячеек от center - r до center + r, не выходящие за пределы местоположения по этой оси."""
+        return range(max(center - r, 0), min(center + r, int(dimension // self._cell_size)) + 1)
+
+    def _cellsAround(self, x, y, z, r):
+        """Перебирает непустые ячейки сетки, удаленные от ячейки точки (x, y, z) не более чем на r ячеек."""
+        cx, cy, cz = self._cellOf(x, y, z)
+        grid = self._grid
+        xs = self._cellRange(cx, r, self._length)
+        ys = self._cellRange(cy, r, self._width)
+        zs = self._cellRange(cz, r, self._height)
+        if len(xs) * len(ys) * len(zs) > len(grid):
+            # Непустых ячеек меньше, чем ячеек в кубе поиска: быстрее перебрать их
+            for cell, bucket in grid.items():
+                if cell[0] in xs and cell[1] in ys and cell[2] in zs:
+                    yield cell, bucket
+            return
+        for i in xs:
+            for j in ys:
+                for k in zs:
+                    bucket = grid.get((i, j, k))
+                    if bucket:
+                        yield (i, j, k), bucket
+
+    def _cellsOnRing(self, x, y, z, ring):
+        """Перебирает непустые ячейки, удаленные от ячейки точки (x, y, z) ровно на ring ячеек (поверхность куба)."""
+        cx, cy, cz = self._cellOf(x, y, z)
+        grid = self._grid
+        ys = self._cellRange(cy, ring, self._width)
+        zs = self._cellRange(cz, ring, self._height)
+        xs = self._cellRange(cx, ring, self._length)
+        if len(xs) * len(ys) * len(zs) > len(grid):
+            # В редко заполненном местоположении быстрее проверить все непустые ячейки
+            for cell, bucket in grid.items():
+                if max(abs(cell[0] - cx), abs(cell[1] - cy), abs(cell[2] - cz)) == ring:
+                    yield cell, bucket
+            return
+        z_faces = [k for k in {cz - ring, cz + ring} if k in zs]
+        for i in xs:
+            on_x_face = abs(i - cx) == ring
+            for j in ys:
+                # На гранях куба перебирается весь столбец по z, внутри - только две крайние ячейки
+                for k in zs if on_x_face or abs(j - cy) == ring else z_faces:
+                    bucket = grid.get((i, j, k))
+                    if bucket:
+                        yield (i, j, k), bucket
+
+    def objects_within(self, x, y, z, radius):
+        """
+        Возвращает объекты, находящиеся не дальше radius от точки (x, y, z).
+        Расстояние считается так же, как в GameObject.distance (с отбрасыванием дробной части).
+
+        Параметры:
+        - x, y, z: int - Координаты точки.
+        - radius: int - Радиус поиска.
+
+        Возвращает:
+        - list - Список найденных объектов.
+        """
+        # int(sqrt(r2)) <= radius означает sqrt(r2) < radius + 1, поэтому просматриваем ячейки с запасом в единицу
+        r = int((radius + 1) // self._cell_size) + 1
+        result = []
+        for _, bucket in self._cellsAround(x, y, z, r):
+            for obj in bucket:
+                dx = obj.x - x
+                dy = obj.y - y
+                dz = obj.z - z
+                if int(math.sqrt(dx ** 2 + dy ** 2 + dz ** 2)) <= radius:
+                    result.append(obj)
+        return result
+
+    def nearest(self, obj, k=1):
+        """
+        Возвращает k ближайших к obj объектов местоположения (сам obj не учитывается).
+        Поиск идет кольцами ячеек вокруг объекта и останавливается, как только более далекие
+        ячейки уже не могут содержать объект ближе найденных.
+
+        Параметры:
+        - obj: GameObject - Объект, для которого ищутся соседи.
+        - k: int - Количество соседей.
+
+        Возвращает:
+        - list - Список объектов, упорядоченный по возрастанию расстояния.
+        """
+        if k <= 0:
+            return []
+        x, y, z = obj.x, obj.y, obj.z
+        size = self._cell_size
+        max_ring = max(self._length, self._width, self._height) // size + 1
+        found = []  # Пары (квадрат расстояния, порядковый номер, объект)
+        ring = 0
+        while ring <= max_ring:
+            for _, bucket in self._cellsOnRing(x, y, z, ring):
+                for other in bucket:
+                    if other is obj:
+                        continue
+                    r2 = (other.x - x) ** 2 + (other.y - y) ** 2 + (other.z - z) ** 2
+                    found.append((r2, len(found), other))
+            # Любой объект за пределами текущего кольца удален не меньше чем на ring * size
+            if len(found) >= k and heapq.nsmallest(k, found)[-1][0] <= (ring * size) ** 2:
+                break
+            ring += 1
+        return [item[2] for item in heapq.nsmallest(k, found)]
 
     def isInside(self, x, y, z) -> bool:
         """
@@ -74,12 +510,165 @@ class Location:
         return self.height * self.length * self.width
 
 
+def _integral(value: float):
+    """Возвращает int, если число с плавающей точкой целое, иначе само число."""
+    return int(value) if value.is_integer() else value
+
+
+class EntityStore:
+    """
+    Класс EntityStore - колоночное хранилище сущностей одного местоположения.
+    Вместо того чтобы каждый объект хранил свои поля в собственном словаре атрибутов,
+    координаты, здоровье и кровотечение всех объектов лежат в непрерывных массивах (array),
+    а объект помнит только номер своей строки (_slot).
+    Все столбцы хранят числа с плавающей точкой, а свойства объектов читают их через _integral,
+    поэтому целые значения остаются int, а дробные (например, здоровье после changeHP(-2.5)) - float.
+
+    Это позволяет одной операцией переместить или ранить всю популяцию объектов,
+    не вызывая свойства каждого объекта по отдельности.
+    """
+
+    def __init__(self, loc: Location):
+        """
+        Инициализация нового хранилища.
+
+        Параметры:
+        - loc: Location - Местоположение, объекты которого хранятся в массивах.
+        """
+        self._loc = loc  # Местоположение, которому принадлежит хранилище
+        self._objs = []  # Объекты в порядке номеров их строк
+        self.x = array('d')  # Координаты x
+        self.y = array('d')  # Координаты y
+        self.z = array('d')  # Координаты z
+        self.hp = array('d')  # Текущее здоровье (0 у неживых объектов)
+        self.max_hp = array('d')  # Максимальное здоровье (0 у неживых объектов)
+        self.bleeding = array('d')  # Уровень кровотечения
+        self.living = array('b')  # 1, если строка принадлежит LivingObject
+
+    def __len__(self):
+        return len(self._objs)
+
+    def add(self, obj):
+        """
+        Переносит поля объекта в массивы хранилища.
+
+        Параметры:
+        - obj: GameObject - Объект, который добавляется в хранилище.
+        """
+        if obj._slot is not None:
+            return
+        self.x.append(obj._x)
+        self.y.append(obj._y)
+        self.z.append(obj._z)
+        del obj._x, obj._y, obj._z
+        if isinstance(obj, LivingObject):
+            self.hp.append(obj._hp)
+            self.max_hp.append(obj._max_hp)
+            self.bleeding.append(obj._bleeding)
+            self.living.append(1)
+            del obj._hp, obj._max_hp, obj._bleeding
+        else:
+            self.hp.append(0)
+            self.max_hp.append(0)
+            self.bleeding.append(0)
+            self.living.append(0)
+        obj._slot = len(self._objs)
+        self._objs.append(obj)
+
+    def remove(self, obj):
+        """
+        Возвращает поля объекта из массивов хранилища в сам объект и освобождает его строку.
+        На место освободившейся строки переносится последняя строка хранилища.
+
+        Параметры:
+        - obj: GameObject - Объект, который удаляется из хранилища.
+        """
+        slot = obj._slot
+        if slot is None:
+            return
+        obj._x, obj._y, obj._z = _integral(self.x[slot]), _integral(self.y[slot]), _integral(self.z[slot])
+        if self.living[slot]:
+            obj._hp, obj._max_hp = _integral(self.hp[slot]), _integral(self.max_hp[slot])
+            obj._bleeding = _integral(self.bleeding[slot])
+        obj._slot = None
+        last = len(self._objs) - 1
+        if slot != last:
+            moved = self._objs[last]
+            for column in (self.x, self.y, self.z, self.hp, self.max_hp, self.bleeding, self.living):
+                column[slot] = column[last]
+            self._objs[slot] = moved
+            moved._slot = slot
+        for column in (self.x, self.y, self.z, self.hp, self.max_hp, self.bleeding, self.living):
+            column.pop()
+        self._objs.pop()
+
+    @staticmethod
+    def _clamped(values, delta, limit):
+        """
+        Возвращает новый массив values + delta, ограниченный отрезком [0, limit].
+        Сложение и ограничение выполняются цепочкой map встроенных функций, без цикла на Python.
+        """
+        deltas = itertools.repeat(delta) if isinstance(delta, (int, float)) else delta
+        return array('d', map(min, map(max, map(operator.add, values, deltas), itertools.repeat(0)),
+                              itertools.repeat(limit)))
+
+    def move(self, dx, dy, dz):
+        """
+        Перемещает все объекты хранилища, ограничивая координаты границами местоположения,
+        так же как это делают сеттеры координат GameObject.
+        Пространственный индекс обновляется только для объектов, перешедших в другую ячейку,
+        а отслеживание изменений - только для полей, которые действительно изменились.
+
+        Параметры:
+        - dx, dy, dz - Величины изменения координат: число для всех объектов сразу
+          или последовательность со своим значением для каждой строки.
+        """
+        loc = self._loc
+        old = self.x, self.y, self.z
+        self.x = self._clamped(self.x, dx, loc.length)
+        self.y = self._clamped(self.y, dy, loc.width)
+        self.z = self._clamped(self.z, dz, loc.height)
+        tracker = loc._tracker
+        if tracker is not None:
+            for field, before, after in zip('xyz', old, (self.x, self.y, self.z)):
+                for obj in itertools.compress(self._objs, map(operator.ne, before, after)):
+                    tracker.mark(obj, field)
+        # Ячейку индекса меняют только объекты, у которых изменился номер ячейки хотя бы по одной оси
+        size = itertools.repeat(loc._cell_size)
+        crossed = [map(operator.ne, map(operator.floordiv, before, size), map(operator.floordiv, after, size))
+                   for before, after in zip(old, (self.x, self.y, self.z))]
+        for obj in itertools.compress(self._objs, map(any, zip(*crossed))):
+            loc.updateIndex(obj)
+
+    def changeHP(self, change):
+        """
+        Изменяет здоровье всех живых объектов хранилища так же, как LivingObject.changeHP:
+        мертвые объекты не меняются, а здоровье ограничено отрезком [0, max_hp].
+        Новый столбец собирается цепочкой map встроенных функций, без цикла на Python.
+
+        Параметры:
+        - change - Величина изменения здоровья: число или последовательность по строкам.
+        """
+        changes = itertools.repeat(change) if isinstance(change, (int, float)) else change
+        old = self.hp
+        changed_hp = map(min, map(max, map(operator.add, old, changes), itertools.repeat(0)), self.max_hp)
+        # Для каждой строки выбирается старое (0) или новое (1) значение: меняются только живые объекты с hp > 0
+        active = map(operator.and_, self.living, map(operator.gt, old, itertools.repeat(0)))
+        self.hp = array('d', map(operator.getitem, zip(old, changed_hp), active))
+        tracker = self._loc._tracker
+        if tracker is not None:
+            for obj in itertools.compress(self._objs, map(operator.ne, old, self.hp)):
+                tracker.mark(obj, 'hp')
+
+
 class GameObject:
     """
     Класс GameObject представляет объект в трехмерном пространстве с координатами x, y, z.
     Он также связан с местоположением (Location), в котором находится объект.
     """
 
+    _slot = None  # Номер строки в EntityStore местоположения (None, если хранилище не используется)
+
     def __init__(self, name: str, loc: Location, x, y, z):
         """
         Инициализация нового объекта GameObject.
@@ -91,13 +680,15 @@ class GameObject:
         """
         self.name = name  # Имя объекта
         self._loc = loc  # Ссылка на местоположение (объект типа Location), где находится объект
-        self._loc.addObject(self)  # Добавление объекта в список объектов местоположения
         self.x, self.y, self.z = x, y, z  # Установка начальных координат объекта
+        self._loc.addObject(self)  # Добавление объекта в список объектов и в индекс местоположения
 
     @property
     def x(self):
         """Свойство, возвращающее текущую координату x."""
-        return self._x
+        if self._slot is None:
+            return self._x
+        return _integral(self._loc._store.x[self._slot])
 
     @x.setter
     def x(self, x):
@@ -108,16 +699,22 @@ class GameObject:
         - x: int - Новое значение координаты x.
         """
         if x < 0:
-            self._x = 0
+            x = 0
         elif self._loc.length < x:
-            self._x = self._loc.length
-        else:
+            x = self._loc.length
+        if self._slot is None:
             self._x = x
+        else:
+            self._loc._store.x[self._slot] = x
+        self._loc.updateIndex(self)  # Обновляем положение объекта в пространственном индексе
+        self._loc.markDirty(self, 'x')
 
     @property
     def y(self):
         """Свойство, возвращающее текущую координату y."""
-        return self._y
+        if self._slot is None:
+            return self._y
+        return _integral(self._loc._store.y[self._slot])
 
     @y.setter
     def y(self, y):
@@ -128,16 +725,22 @@ class GameObject:
         - y: int - Новое значение координаты y.
         """
         if y < 0:
-            self._y = 0
+            y = 0
         elif self._loc.width < y:
-            self._y = self._loc.width
-        else:
+            y = self._loc.width
+        if self._slot is None:
             self._y = y
+        else:
+            self._loc._store.y[self._slot] = y
+        self._loc.updateIndex(self)  # Обновляем положение объекта в пространственном индексе
+        self._loc.markDirty(self, 'y')
 
     @property
     def z(self):
         """Свойство, возвращающее текущую координату z."""
-        return self._z
+        if self._slot is None:
+            return self._z
+        return _integral(self._loc._store.z[self._slot])
 
     @z.setter
     def z(self, z):
@@ -148,11 +751,15 @@ class GameObject:
         - z: int - Новое значение координаты z.
         """
         if z < 0:
-            self._z = 0
+            z = 0
         elif self._loc.height < z:
-            self._z = self._loc.height
-        else:
+            z = self._loc.height
+        if self._slot is None:
             self._z = z
+        else:
+            self._loc._store.z[self._slot] = z
+        self._loc.updateIndex(self)  # Обновляем положение объекта в пространственном индексе
+        self._loc.markDirty(self, 'z')
 
     def move(self, x, y, z):
         """
@@ -198,11 +805,13 @@ class LivingObject(GameObject):
         - x, y, z: int - Начальные координаты объекта в трехмерном пространстве.
         - hp: int - Начальное количество здоровья объекта.
         """
-        super().__init__(name, loc, x, y, z)  # Вызов конструктора родительского класса
         self._max_hp = hp  # Максимальное количество здоровья
         self._hp = hp  # Текущее количество здоровья
         self._bleeding = 0  # Уровень кровотечения
         self._inventory = []  # Инвентарь
+        # Конструктор родителя вызывается последним: он добавляет объект в местоположение,
+        # и если там включен EntityStore, все поля объекта уже должны быть заданы
+        super().__init__(name, loc, x, y, z)
 
     @property
     def inventory(self):
@@ -223,6 +832,7 @@ class LivingObject(GameObject):
         """
         if item not in self._inventory:
             self._inventory.append(item)
+            self._loc.markDirty(self, 'inventory')
             item.pickUp(self)  # Вызываем метод pickUp у предмета, чтобы он выполнил действия при подборе
 
     def useItem(self, item):
@@ -238,12 +848,24 @@ class LivingObject(GameObject):
     @property
     def maxHP(self):
         """Свойство, возвращающее максимальное количество здоровья."""
-        return self._max_hp
+        if self._slot is None:
+            return self._max_hp
+        return _integral(self._loc._store.max_hp[self._slot])
 
     @property
     def hp(self):
         """Свойство, возвращающее текущее количество здоровья."""
-        return self._hp
+        if self._slot is None:
+            return self._hp
+        return _integral(self._loc._store.hp[self._slot])
+
+    def _setHP(self, hp):
+        """Записывает текущее количество здоровья в объект или в EntityStore."""
+        if self._slot is None:
+            self._hp = hp
+        else:
+            self._loc._store.hp[self._slot] = hp
+        self._loc.markDirty(self, 'hp')
 
     def changeHP(self, change):
         """
@@ -254,11 +876,12 @@ class LivingObject(GameObject):
         """
         if not self.alive:  # Если объект мертв, игнорируем изменение здоровья
             return
-        self._hp += change
-        if self._hp < 0:  # Здоровье не может быть отрицательным
-            self._hp = 0
-        if self._hp > self._max_hp:  # Здоровье не может превышать максимальное значение
-            self._hp = self._max_hp
+        hp = self.hp + change
+        if hp < 0:  # Здоровье не может быть отрицательным
+            hp = 0
+        if hp > self.maxHP:  # Здоровье не может превышать максимальное значение
+            hp = self.maxHP
+        self._setHP(hp)
 
     @property
     def alive(self):
@@ -268,7 +891,7 @@ class LivingObject(GameObject):
         Возвращает:
         - bool - True, если объект жив, False в противном случае.
         """
-        return self._hp > 0
+        return self.hp > 0
 
     def eat(self, obj):
         """
@@ -284,7 +907,9 @@ class LivingObject(GameObject):
     @property
     def bleeding(self):
         """Свойство, возвращающее уровень кровотечения."""
-        return self._bleeding
+        if self._slot is None:
+            return self._bleeding
+        return _integral(self._loc._store.bleeding[self._slot])
 
     def changeBleeding(self, change):
         """
@@ -293,8 +918,19 @@ class LivingObject(GameObject):
         Параметры:
         - change: int - Величина изменения уровня кровотечения.
         """
-        self._bleeding += change
+        self._setBleeding(self.bleeding + change)
         self.changeHP(-change)  # Уменьшаем здоровье на величину кровотечения
+        world = self._loc._world
+        if change > 0 and world is not None:
+            world.trackBleeding(self)  # Дальше кровотечение будет наносить урон с течением времени
+
+    def _setBleeding(self, bleeding):
+        """Записывает уровень кровотечения в объект или в EntityStore."""
+        if self._slot is None:
+            self._bleeding = bleeding
+        else:
+            self._loc._store.bleeding[self._slot] = bleeding
+        self._loc.markDirty(self, 'bleeding')
 
 
 class Weapon(GameObject):
@@ -350,6 +986,44 @@ class Weapon(GameObject):
             return
         obj.changeHP(-self.damage)  # Уменьшаем здоровье цели на величину урона оружия
 
+    def _targetsInRadius(self, targets=None):
+        """
+        Отбирает цели, находящиеся в радиусе действия оружия.
+        Квадраты расстояний считаются одним проходом по всем целям, а условие попадания
+        совпадает с attack: целочисленное расстояние не больше радиуса.
+
+        Параметры:
+        - targets: list - Список целей. Если не указан, берутся живые объекты местоположения
+          в радиусе действия (через пространственный индекс).
+
+        Возвращает:
+        - list - Цели, попавшие в радиус действия.
+        """
+        if targets is None:
+            return [obj for obj in self._loc.objects_within(self.x, self.y, self.z, self.radius)
+                    if isinstance(obj, LivingObject)]
+        x, y, z, radius = self.x, self.y, self.z, self.radius
+        sqrt = math.sqrt
+        r2 = [(obj.x - x) ** 2 + (obj.y - y) ** 2 + (obj.z - z) ** 2 for obj in targets]
+        return [obj for obj, d2 in zip(targets, r2) if int(sqrt(d2)) <= radius]
+
+    def attack_area(self, targets=None):
+        """
+        Выполняет атаку по площади: урон получают все цели в радиусе действия оружия.
+        Результат для каждой цели такой же, как при вызове attack по отдельности.
+
+        Параметры:
+        - targets: list - Список живых объектов. Если не указан, атакуются все живые объекты
+          местоположения в радиусе действия.
+
+        Возвращает:
+        - list - Цели, по которым была нанесена атака.
+        """
+        hit = self._targetsInRadius(targets)
+        for obj in hit:
+            obj.changeHP(-self.damage)
+        return hit
+
 
 class ColdWeapon(Weapon):
     """
@@ -394,13 +1068,34 @@ class ColdWeapon(Weapon):
             return
         obj.changeBleeding(self.bleeding_damage)  # Вызываем метод changeBleeding у цели
 
+    def cause_bleeding_area(self, targets=None):
+        """
+        Наносит урон от кровотечения всем целям в радиусе действия холодного оружия.
+
+        Параметры:
+        - targets: list - Список живых объектов. Если не указан, берутся все живые объекты
+          местоположения в радиусе действия.
+
+        Возвращает:
+        - list - Цели, у которых было вызвано кровотечение.
+        """
+        hit = self._targetsInRadius(targets)
+        for obj in hit:
+            obj.changeBleeding(self.bleeding_damage)
+        return hit
+
 
 class ThrowingWeapon(Weapon):
     """
     Класс ThrowingWeapon представляет собой метательное оружие, являющееся подклассом класса Weapon.
     Метательное оружие обладает методом для выполнения метания в определенном направлении.
+
+    Снаряд летит по отрезку от оружия до точки падения и поражает первый живой объект,
+    который оказался ближе hit_radius к траектории.
     """
 
+    hit_radius = 1  # Насколько близко к траектории должен оказаться объект, чтобы в него попали
+
     def __init__(self, name: str, loc: Location, x, y, z, damage, radius):
         """
         Инициализация нового объекта ThrowingWeapon.
@@ -416,19 +1111,125 @@ class ThrowingWeapon(Weapon):
 
     def throw_on_direction(self, angle: float, radius: float):
         """
-        Выполняет метание в определенном направлении.
+        Выполняет метание в определенном направлении и наносит урон первому живому объекту на пути снаряда.
 
         Параметры:
         - angle: float - Угол (в радианах), в направлении которого выполняется метание.
         - radius: float - Расстояние, на которое происходит метание.
-        """
-        # Преобразование полярных координат в декартовы координаты
-        target_x = self.x + radius * math.cos(angle)
-        target_y = self.y + radius * math.sin(angle)
-        target_z = self.z  # Предполагаем, что метательное оружие стреляет в плоскости XY
 
+        Возвращает:
+        - LivingObject - Объект, в который попал снаряд, или None, если снаряд никого не задел.
+        """
         # Вывод сообщения о выполнении выстрела
         print(f"{self.name} выполнил выстрел в направлении {math.degrees(angle)} градусов.")
+        return self._resolveThrow(math.cos(angle), math.sin(angle), radius)
+
+    def throw_many(self, throws):
+        """
+        Выполняет серию метаний за один вызов (например, все броски за тик).
+        Синусы и косинусы всех углов вычисляются заранее одним проходом, а кандидаты
+        для всех бросков берутся из индекса местоположения одним запросом: все траектории
+        начинаются в точке, где лежит оружие, и не длиннее самой дальней из них.
+
+        Параметры:
+        - throws: list - Пары (angle, radius) для каждого броска.
+
+        Возвращает:
+        - list - Для каждого броска объект, в который попал снаряд, или None.
+        """
+        cos, sin = math.cos, math.sin
+        directions = [(cos(angle), sin(angle), self._pathLength(cos(angle), sin(angle), radius))
+                      for angle, radius in throws]
+        longest = max((length for _, _, length in directions), default=0)
+        if longest <= 0:
+            return [None] * len(directions)
+        candidates = [obj for obj in self._loc.objects_within(self.x, self.y, self.z,
+                                                              math.ceil(longest + self.hit_radius))
+                      if isinstance(obj, LivingObject)]
+        hits = []
+        for dx, dy, length in directions:
+            best, best_t = None, None
+            if length > 0:
+                for obj in candidates:
+                    t = self._hitDistance(obj, dx, dy, length)
+                    if t is not None and (best_t is None or t < best_t):
+                        best, best_t = obj, t
+            if best is not None:
+                best.changeHP(-self.damage)  # Уменьшаем здоровье цели на величину урона оружия
+            hits.append(best)
+        return hits
+
+    def _pathLength(self, dx: float, dy: float, radius: float):
+        """Длина траектории броска: снаряд не вылетает за границы местоположения."""
+        loc = self._loc
+        x0, y0 = self.x, self.y
+        length = radius
+        if dx > 0:
+            length = min(length, (loc.length - x0) / dx)
+        elif dx < 0:
+            length = min(length, -x0 / dx)
+        if dy > 0:
+            length = min(length, (loc.width - y0) / dy)
+        elif dy < 0:
+            length = min(length, -y0 / dy)
+        return length
+
+    def _hitDistance(self, obj, dx: float, dy: float, length: float):
+        """
+        Возвращает расстояние вдоль траектории до точки, ближайшей к объекту, если снаряд задевает объект,
+        иначе None. Объекты с проекцией позади бросающего, на уровне бросающего (рядом с ним или в той же
+        точке, как тот, кто держит оружие) и дальше конца траектории не задеваются.
+        """
+        if obj is self or not isinstance(obj, LivingObject) or not obj.alive or self in obj.inventory:
+            return None
+        # Проекция объекта на направление броска и расстояние от него до траектории
+        px, py, pz = obj.x - self.x, obj.y - self.y, obj.z - self.z  # Оружие стреляет в плоскости XY
+        t = px * dx + py * dy
+        if not 1e-9 < t <= length:
+            return None
+        if (px - dx * t) ** 2 + (py - dy * t) ** 2 + pz ** 2 <= self.hit_radius ** 2:
+            return t
+        return None
+
+    def _resolveThrow(self, dx: float, dy: float, radius: float):
+        """
+        Проводит снаряд по траектории и наносит урон первому живому объекту на его пути.
+
+        Траектория разбивается на участки длиной в ячейку пространственного индекса.
+        Для каждого участка кандидаты берутся из индекса местоположения (грубая фаза),
+        а затем для них считается ближайшая к объекту точка отрезка (точная фаза).
+        Проверка останавливается на первом участке, где нашлось попадание.
+
+        Параметры:
+        - dx, dy: float - Косинус и синус угла броска.
+        - radius: float - Дальность броска.
+        """
+        loc = self._loc
+        x0, y0, z0 = self.x, self.y, self.z
+        length = self._pathLength(dx, dy, radius)
+        if length <= 0:
+            return None
+
+        hit_radius = self.hit_radius
+        step = loc._cell_size
+        start = 0.0
+        while start < length:
+            end = min(start + step, length)
+            middle = (start + end) / 2
+            candidates = loc.objects_within(x0 + dx * middle, y0 + dy * middle, z0,
+                                            math.ceil((end - start) / 2 + hit_radius))
+            best, best_t = None, None
+            for obj in candidates:
+                t = self._hitDistance(obj, dx, dy, length)
+                if t is None or not start <= t <= end:
+                    continue  # Промах или ближайшая точка траектории лежит на другом участке
+                if best_t is None or t < best_t:
+                    best, best_t = obj, t
+            if best is not None:
+                best.changeHP(-self.damage)  # Уменьшаем здоровье цели на величину урона оружия
+                return best
+            start = end
+        return None
 
 
 class Eatable(ABC):
@@ -470,6 +1271,9 @@ class Eatable(ABC):
         """
         if not self.eaten:
             self._eaten = True  # Устанавливаем флаг, что объект был съеден
+            loc = getattr(self, '_loc', None)
+            if loc is not None:
+                loc.markDirty(self, 'eaten')
             return self._hp  # Возвращаем количество здоровья, которое восстанавливается при съедении
         else:
             return 0  # Если объект уже был съеден, возвращаем 0 здоровья
@@ -646,4 +1450,534 @@ class Cookable(GameObject, Eatable, Burnable):
         if self.burned:
             eater.changeHP(hp)  # Если объект приготовлен, восстанавливаем здоровье объекта, который съедает
         else:
-            eater.pickUpItem(self)  # Иначе, поднимаем объект, который съедает
\ No newline at end of file
+            eater.pickUpItem(self)  # Иначе, поднимаем объект, который съедает
+
+
+class World:
+    """
+    Класс World представляет собой игровой мир, объединяющий несколько местоположений
+    и продвигающий время в них фиксированными шагами (тиками).
+
+    Все отложенные действия (урон от кровотечения, временные эффекты, рост грибов и т.п.)
+    хранятся в очереди с приоритетом по номеру тика, поэтому объекты, с которыми ничего
+    не происходит, не требуют никакой работы на каждом тике.
+    """
+
+    def __init__(self, step: float = 1.0, bleed_interval: int = 1, history: int = 10000):
+        """
+        Инициализация нового мира.
+
+        Параметры:
+        - step: float - Продолжительность одного тика в игровом времени.
+        - bleed_interval: int - Через сколько тиков кровотечение наносит очередной урон.
+        - history: int - Сколько последних длительностей тиков хранить для статистики.
+        """
+        self._step = step  # Продолжительность тика
+        self._bleed_interval = bleed_interval  # Период урона от кровотечения в тиках
+        self._tick = 0  # Номер текущего тика
+        self._locations = []  # Местоположения мира
+        self._events = []  # Куча событий (тик, порядковый номер, функция, аргументы)
+        self._counter = itertools.count()  # Порядковые номера событий для устойчивой сортировки
+        self._bleeding = set()  # Объекты, для которых уже запланирован урон от кровотечения
+        self._durations = deque(maxlen=history)  # Длительности последних тиков в секундах
+
+    @property
+    def tick_number(self):
+        """Свойство, возвращающее номер текущего тика."""
+        return self._tick
+
+    @property
+    def time(self):
+        """Свойство, возвращающее текущее игровое время."""
+        return self._tick * self._step
+
+    @property
+    def locations(self):
+        """Свойство, возвращающее список местоположений мира."""
+        return self._locations
+
+    def addLocation(self, loc: Location):
+        """
+        Добавляет местоположение в мир. Уже кровоточащие живые объекты начинают терять здоровье.
+
+        Параметры:
+        - loc: Location - Добавляемое местоположение.
+        """
+        if loc._world is self:
+            return
+        loc._world = self
+        self._locations.append(loc)
+        for obj in loc._objs:
+            if isinstance(obj, LivingObject) and obj.bleeding > 0:
+                self.trackBleeding(obj)
+
+    def schedule(self, delay: int, callback, *args):
+        """
+        Планирует вызов callback(*args) через delay тиков.
+
+        Параметры:
+        - delay: int - Через сколько тиков выполнить действие (не меньше 1).
+        - callback - Вызываемый объект.
+        - args - Аргументы для callback.
+        """
+        heapq.heappush(self._events, (self._tick + max(delay, 1), next(self._counter), callback, args))
+
+    def scheduleMushroom(self, delay: int, loc: Location, x, y, z):
+        """
+        Планирует появление гриба (Cookable.growMushroom) через delay тиков.
+
+        Параметры:
+        - delay: int - Через сколько тиков вырастет гриб.
+        - loc: Location - Местоположение, где должен появиться гриб.
+        - x, y, z: int - Координаты места появления гриба.
+        """
+        self.schedule(delay, Cookable.growMushroom, loc, x, y, z)
+
+    def trackBleeding(self, obj: LivingObject):
+        """
+        Начинает наносить объекту урон от кровотечения с течением времени.
+        Каждые bleed_interval тиков объект теряет здоровье, равное уровню кровотечения,
+        после чего уровень кровотечения уменьшается на 1, пока не станет равным нулю.
+
+        Параметры:
+        - obj: LivingObject - Кровоточащий объект.
+        """
+        if obj not in self._bleeding:
+            self._bleeding.add(obj)
+            self.schedule(self._bleed_interval, self._bleed, obj)
+
+    def _bleed(self, obj):
+        """Наносит урон от кровотечения и, если эффект не закончился, планирует следующий."""
+        if obj not in self._bleeding:  # Объект уже покинул мир
+            return
+        if not obj.alive or obj.bleeding <= 0:
+            self._bleeding.discard(obj)
+            return
+        obj.changeHP(-obj.bleeding)
+        obj._setBleeding(obj.bleeding - 1)  # Кровотечение постепенно останавливается
+        if obj.alive and obj.bleeding > 0:
+            self.schedule(self._bleed_interval, self._bleed, obj)
+        else:
+            self._bleeding.discard(obj)
+
+    def addEffect(self, obj: LivingObject, change: int, duration: int, interval: int = 1):
+        """
+        Добавляет временный эффект: каждые interval тиков здоровье объекта меняется на change,
+        пока не пройдет duration тиков (например, действие яда или лечения).
+
+        Параметры:
+        - obj: LivingObject - Объект, на который действует эффект.
+        - change: int - Изменение здоровья за одно срабатывание.
+        - duration: int - Продолжительность эффекта в тиках.
+        - interval: int - Период срабатывания эффекта в тиках.
+        """
+        self.schedule(interval, self._applyEffect, obj, change, self._tick + duration, interval)
+
+    def _applyEffect(self, obj, change, expires, interval):
+        """
+        Срабатывание временного эффекта; по истечении срока эффект больше не планируется.
+        Эффект объекта, который уже не находится ни в одном местоположении мира, отменяется.
+        """
+        loc = obj._loc
+        if loc is None or loc._world is not self or obj not in loc._cells:
+            return
+        if self._tick > expires or not obj.alive:
+            return
+        obj.changeHP(change)
+        if self._tick + interval <= expires:
+            self.schedule(interval, self._applyEffect, obj, change, expires, interval)
+
+    def tick(self):
+        """Продвигает мир на один тик и выполняет все события, запланированные на этот тик."""
+        start = time.perf_counter()
+        self._tick += 1
+        events = self._events
+        while events and events[0][0] <= self._tick:
+            _, _, callback, args = heapq.heappop(events)
+            callback(*args)
+        self._durations.append(time.perf_counter() - start)
+
+    def run(self, ticks: int):
+        """
+        Продвигает мир на несколько тиков.
+
+        Параметры:
+        - ticks: int - Количество тиков.
+        """
+        for _ in range(ticks):
+            self.tick()
+
+    def tickPercentiles(self, percentiles=(50, 90, 99)):
+        """
+        Возвращает перцентили длительности последних тиков (в секундах).
+
+        Параметры:
+        - percentiles - Перечень перцентилей от 0 до 100.
+
+        Возвращает:
+        - dict - Перцентиль -> длительность тика в секундах.
+        """
+        durations = sorted(self._durations)
+        if not durations:
+            return {p: 0.0 for p in percentiles}
+        n = len(durations)
+        return {p: durations[min(n - 1, max(0, math.ceil(p / 100 * n) - 1))] for p in percentiles}
+
+
+_SNAPSHOT_MAGIC = b'LOCS'  # Сигнатура файла снимка местоположения
+_SNAPSHOT_VERSION = 3  # Версия формата снимка
+# Сигнатура, версия, флаг EntityStore, число объектов, длина имени, ширина, высота, длина, размер ячейки,
+# число классов, длина таблицы классов и длина блока имен объектов в байтах
+_SNAPSHOT_HEADER = '<4sHHqqqqqdqqq'
+# Классы объектов, которые передаются репликам местоположения; класс записывается номером в этом кортеже
+_SNAPSHOT_KINDS = (GameObject, LivingObject, Weapon, ColdWeapon, ThrowingWeapon, Food, Poison, Cookable)
+
+
+def _snapshotKind(obj):
+    """
+    Возвращает номер класса объекта в _SNAPSHOT_KINDS.
+    Для подкласса берется ближайший по цепочке наследования известный класс.
+    """
+    for cls in type(obj).__mro__:
+        if cls in _SNAPSHOT_KINDS:
+            return _SNAPSHOT_KINDS.index(cls)
+    raise TypeError(f"Объект {obj.name!r} типа {type(obj).__name__} нельзя сохранить в снимок")
+
+
+def _snapshotClass(entry):
+    """
+    Возвращает класс объекта по записи 'модуль:полное имя' из таблицы классов снимка.
+    Класс ищется только среди подклассов GameObject; если модуль, из которого класс был сохранен,
+    загружен под другим именем (например, как __main__), берется единственный класс с таким именем.
+    """
+    module, _, qualname = entry.partition(':')
+    candidates, pending = [], [GameObject]
+    while pending:
+        kind = pending.pop()
+        if kind.__qualname__ == qualname:
+            candidates.append(kind)
+        pending.extend(kind.__subclasses__())
+    exact = [kind for kind in candidates if kind.__module__ == module]
+    if len(exact) == 1 or len(candidates) == 1:
+        return (exact or candidates)[0]
+    raise ValueError(f"Класс объекта {entry!r} из снимка не найден")
+
+
+def _objectFields(obj, ids):
+    """
+    Возвращает значения всех реплицируемых полей объекта.
+    Инвентарь записывается идентификаторами объектов из словаря ids.
+    """
+    fields = {'x': obj.x, 'y': obj.y, 'z': obj.z}
+    if isinstance(obj, LivingObject):
+        fields.update(hp=obj.hp, max_hp=obj.maxHP, bleeding=obj.bleeding,
+                      inventory=[ids[item] for item in obj.inventory if item in ids])
+    if isinstance(obj, Weapon):
+        fields.update(damage=obj.damage, radius=obj.radius)
+    if isinstance(obj, ColdWeapon):
+        fields['bleeding_damage'] = obj.bleeding_damage
+    if isinstance(obj, Eatable):
+        fields.update(food_hp=obj._hp, eaten=obj.eaten)
+    if isinstance(obj, Burnable):
+        fields['burned'] = obj.burned
+    return fields
+
+
+class ChangeTracker:
+    """
+    Класс ChangeTracker накапливает изменения объектов одного местоположения между тиками.
+
+    Сеттеры координат, изменения здоровья, кровотечения, инвентаря и флага съеденности
+    отмечают объект "грязным" и добавляют имя поля в его набор измененных полей.
+    Метод collect собирает компактную дельту, в которой для каждого объекта есть только
+    последние значения измененных полей, поэтому объем передаваемых данных зависит
+    от количества изменений, а не от размера мира.
+    """
+
+    def __init__(self, loc: Location):
+        """
+        Инициализация отслеживания изменений.
+
+        Параметры:
+        - loc: Location - Местоположение, изменения которого отслеживаются.
+        """
+        self._loc = loc  # Отслеживаемое местоположение
+        # Идентификаторы объектов совпадают с их порядковыми номерами в момент включения отслеживания,
+        # поэтому реплика, восстановленная из снимка, сделанного в этот момент, получает те же номера
+        self._ids = {obj: i for i, obj in enumerate(loc._objs)}
+        self._next_id = len(self._ids)
+        self._dirty = {}  # Объект -> множество измененных полей
+        self._added = []  # Объекты, добавленные после последней дельты
+        self._removed = []  # Идентификаторы объектов, удаленных после последней дельты
+
+    def mark(self, obj, field: str):
+        """Отмечает изменение поля field у объекта obj."""
+        if obj in self._ids:
+            self._dirty.setdefault(obj, set()).add(field)
+
+    def added(self, obj):
+        """Регистрирует объект, добавленный в местоположение."""
+        if obj not in self._ids:
+            self._ids[obj] = self._next_id
+            self._next_id += 1
+            self._added.append(obj)
+
+    def removed(self, obj):
+        """Регистрирует объект, удаленный из местоположения."""
+        obj_id = self._ids.pop(obj, None)
+        if obj_id is not None:
+            self._dirty.pop(obj, None)
+            self._removed.append(obj_id)
+
+    def collect(self):
+        """
+        Собирает дельту изменений с момента предыдущего вызова и сбрасывает отметки.
+
+        Возвращает:
+        - dict - Дельта: добавленные объекты, измененные поля и удаленные объекты.
+        """
+        ids = self._ids
+        added = {}
+        for obj in self._added:
+            if obj in ids:
+                added[ids[obj]] = [_snapshotKind(obj), obj.name, _objectFields(obj, ids)]
+                self._dirty.pop(obj, None)  # Все поля нового объекта уже попали в дельту
+        changed = {}
+        for obj, fields in self._dirty.items():
+            values = _objectFields(obj, ids)
+            changed[ids[obj]] = {field: values[field] for field in fields}
+        delta = {'added': added, 'changed': changed, 'removed': self._removed}
+        self._dirty = {}
+        self._added = []
+        self._removed = []
+        return delta
+
+    @staticmethod
+    def serialize(delta) -> bytes:
+        """Упаковывает дельту в компактное текстовое представление JSON."""
+        return json.dumps(delta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class LocationReplica:
+    """
+    Класс LocationReplica поддерживает копию местоположения в актуальном состоянии,
+    применяя к ней дельты, собранные ChangeTracker.
+
+    Реплика создается из снимка местоположения (Location.saveSnapshot / loadSnapshot),
+    сделанного в момент включения отслеживания изменений.
+    """
+
+    def __init__(self, loc: Location):
+        """
+        Инициализация реплики.
+
+        Параметры:
+        - loc: Location - Копия местоположения, восстановленная из снимка.
+        """
+        self.loc = loc  # Местоположение-копия
+        self._objs = dict(enumerate(loc._objs))  # Идентификатор -> объект
+
+    def apply(self, delta):
+        """
+        Применяет дельту к копии местоположения.
+
+        Параметры:
+        - delta: dict или bytes - Дельта из ChangeTracker.collect или результат ChangeTracker.serialize.
+        """
+        if isinstance(delta, (bytes, bytearray)):
+            delta = json.loads(delta)
+        loc = self.loc
+        for obj_id in delta['removed']:
+            obj = self._objs.pop(int(obj_id), None)
+            if obj is not None:
+                loc.removeObject(obj)
+        for obj_id, (kind_index, name, fields) in delta['added'].items():
+            kind = _SNAPSHOT_KINDS[kind_index]
+            obj = kind.__new__(kind)  # Конструктор не вызывается: поля задаются из дельты
+            obj.name = name
+            obj._loc = loc
+            obj._x, obj._y, obj._z = fields['x'], fields['y'], fields['z']
+            if issubclass(kind, LivingObject):
+                obj._hp, obj._max_hp, obj._bleeding, obj._inventory = \
+                    fields['hp'], fields['max_hp'], fields['bleeding'], []
+            if issubclass(kind, Weapon):
+                obj._damage, obj._radius = fields['damage'], fields['radius']
+            if issubclass(kind, ColdWeapon):
+                obj._bleeding_damage = fields['bleeding_damage']
+            if issubclass(kind, Eatable):
+                obj._hp, obj._eaten = fields['food_hp'], fields['eaten']
+            if issubclass(kind, Burnable):
+                obj._burned = fields['burned']
+            self._objs[int(obj_id)] = obj
+            loc.addObject(obj)
+        # Инвентарь новых объектов может ссылаться на другие новые объекты, поэтому он заполняется вторым проходом
+        for obj_id, (_, _, fields) in delta['added'].items():
+            if 'inventory' in fields:
+                self._objs[int(obj_id)]._inventory = [self._objs[i] for i in fields['inventory']]
+        for obj_id, fields in delta['changed'].items():
+            obj = self._objs[int(obj_id)]
+            for field, value in fields.items():
+                if field in ('x', 'y', 'z'):
+                    setattr(obj, field, value)
+                elif field == 'hp':
+                    obj._setHP(value)
+                elif field == 'bleeding':
+                    obj._setBleeding(value)
+                elif field == 'inventory':
+                    obj._inventory = [self._objs[i] for i in value]
+                elif field == 'eaten':
+                    obj._eaten = value
+
+
+def _snapshotLocation(loc: Location):
+    """
+    Возвращает снимок состояния местоположения: для каждого объекта имя, класс, координаты
+    и здоровье (None у неживых объектов).
+    """
+    return [(obj.name, type(obj).__name__, obj.x, obj.y, obj.z,
+             obj.hp if isinstance(obj, LivingObject) else None) for obj in loc._objs]
+
+
+def _shardWorker(conn, locations, step, bleed_interval):
+    """
+    Главный цикл процесса-шарда: держит свою часть местоположений в отдельном мире (World)
+    и выполняет команды, которые присылает ShardedWorld.
+    """
+    world = World(step, bleed_interval)
+    by_name = {}
+    for loc in locations:
+        world.addLocation(loc)
+        by_name[loc.name] = loc
+    while True:
+        command, args = conn.recv()
+        if command == 'tick':
+            world.run(args)
+            conn.send({name: _snapshotLocation(loc) for name, loc in by_name.items()})
+        elif command == 'detach':
+            loc_name, obj_name = args
+            loc = by_name[loc_name]
+            obj = next((o for o in loc._objs if o.name == obj_name), None)
+            if obj is None:
+                conn.send(None)
+                continue
+            carried = [obj] + [item for item in getattr(obj, '_inventory', ()) if item in loc._cells]
+            for item in carried:
+                loc.removeObject(item)
+            # Ссылки на местоположение шарда убираются, чтобы оно не копировалось вместе с объектами
+            for item in carried + list(getattr(obj, '_inventory', ())):
+                if getattr(item, '_loc', None) is loc:
+                    item._loc = None
+            conn.send(carried)
+        elif command == 'attach':
+            loc_name, carried = args
+            loc = by_name[loc_name]
+            for item in carried:
+                item._loc = loc
+                item.x, item.y, item.z = item.x, item.y, item.z  # Координаты ограничиваются новыми границами
+                loc.addObject(item)
+                if isinstance(item, LivingObject) and item.bleeding > 0:
+                    world.trackBleeding(item)
+            conn.send(True)
+        elif command == 'percentiles':
+            conn.send(world.tickPercentiles(args))
+        elif command == 'stop':
+            conn.send(True)
+            break
+    conn.close()
+
+
+class ShardedWorld:
+    """
+    Класс ShardedWorld распределяет местоположения игрового мира по нескольким процессам (шардам).
+    Каждое местоположение независимо от остальных, поэтому шарды продвигают время параллельно,
+    а ShardedWorld лишь рассылает команды, собирает снимки состояния после тиков
+    и переносит объекты между местоположениями, находящимися в разных процессах.
+    """
+
+    def __init__(self, locations, processes: int = None, step: float = 1.0, bleed_interval: int = 1):
+        """
+        Инициализация и запуск процессов-шардов.
+
+        Параметры:
+        - locations: list - Местоположения мира (имена должны быть уникальными).
+        - processes: int - Количество процессов (по умолчанию - количество ядер).
+        - step: float - Продолжительность одного тика.
+        - bleed_interval: int - Период урона от кровотечения в тиках.
+        """
+        processes = min(processes or multiprocessing.cpu_count(), len(locations)) or 1
+        shards = [locations[i::processes] for i in range(processes)]  # Равномерное распределение по шардам
+        self._owner = {}  # Имя местоположения -> номер шарда
+        self._conns = []  # Каналы связи с шардами
+        self._procs = []  # Процессы шардов
+        for number, shard in enumerate(shards):
+            for loc in shard:
+                self._owner[loc.name] = number
+            parent, child = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_shardWorker, args=(child, shard, step, bleed_interval),
+                                           daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def _request(self, shard: int, command: str, args=None):
+        """Отправляет команду одному шарду и дожидается ответа."""
+        conn = self._conns[shard]
+        conn.send((command, args))
+        return conn.recv()
+
+    def tick(self, ticks: int = 1):
+        """
+        Продвигает все шарды на ticks тиков параллельно.
+
+        Возвращает:
+        - dict - Имя местоположения -> снимок его объектов после тиков.
+        """
+        for conn in self._conns:  # Сначала рассылаем команду всем шардам, чтобы они работали одновременно
+            conn.send(('tick', ticks))
+        snapshot = {}
+        for conn in self._conns:
+            snapshot.update(conn.recv())
+        return snapshot
+
+    def moveObject(self, obj_name: str, src: str, dst: str):
+        """
+        Переносит объект (вместе с предметами его инвентаря) из одного местоположения в другое,
+        даже если они обслуживаются разными процессами.
+
+        Параметры:
+        - obj_name: str - Имя переносимого объекта.
+        - src: str - Имя исходного местоположения.
+        - dst: str - Имя местоположения назначения.
+
+        Возвращает:
+        - bool - True, если объект был найден и перенесен.
+        """
+        carried = self._request(self._owner[src], 'detach', (src, obj_name))
+        if carried is None:
+            return False
+        return self._request(self._owner[dst], 'attach', (dst, carried))
+
+    def tickPercentiles(self, percentiles=(50, 90, 99)):
+        """
+        Возвращает перцентили длительности тиков по каждому шарду.
+
+        Возвращает:
+        - list - Словари перцентилей в порядке номеров шардов.
+        """
+        return [self._request(number, 'percentiles', percentiles) for number in range(len(self._conns))]
+
+    def close(self):
+        """Останавливает процессы шардов."""
+        for number, proc in enumerate(self._procs):
+            if proc.is_alive():
+                self._request(number, 'stop')
+            proc.join()
+        self._procs = []
+        self._conns = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
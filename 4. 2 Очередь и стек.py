@@ -1,3 +1,11 @@
+import asyncio
+import sys
+import threading
+import time
+import timeit
+from array import array
+
+
 class Stack:
     """
    Стек — это коллекция, элементы которой получают по принципу «последний вошел, первый вышел»
@@ -31,43 +39,573 @@ class Stack:
         return self.stack_list[-1]
 
 
+class TypedStack:
+    """
+   Стек целых (или вещественных) чисел в типизированном массиве array.array.
+   В списке каждое число - отдельный объект int (около 28 байт) плюс 8 байт на ссылку,
+   а в массиве с кодом 'q' число занимает 8 байт, с кодом 'i' - 4 байта.
+   Массив растет с запасом, поэтому push выполняется за амортизированное O(1).
+    """
+
+    def __init__(self, typecode: str = 'q', items=()):
+        self.stack_array = array(typecode, items)
+
+    def __len__(self):
+        return len(self.stack_array)
+
+    def pop(self):
+        """
+        Удаляет элемент с вершины стека и возвращает его.
+        """
+        return self.stack_array.pop()
+
+    def push(self, num: int):
+        """
+        Операция добавления элемента на вершину стек
+        """
+        self.stack_array.append(num)
+
+    def push_many(self, nums):
+        """
+        Добавляет на вершину сразу несколько элементов (последний из них станет вершиной).
+        Массив того же типа копируется целиком, без цикла по элементам.
+        """
+        self.stack_array.extend(nums)
+
+    def pop_many(self, n: int):
+        """
+        Удаляет n верхних элементов и возвращает их массивом в порядке добавления (вершина - последняя).
+        """
+        if n > len(self.stack_array):
+            raise IndexError("pop from empty stack")
+        top = self.stack_array[len(self.stack_array) - n:]
+        del self.stack_array[len(self.stack_array) - n:]
+        return top
+
+    @property
+    def top_element(self):
+        """
+       Верхний элемент стека (не удаляется).
+        """
+        return self.stack_array[-1]
+
+    def view(self):
+        """
+       Содержимое стека через протокол буфера (memoryview) без копирования, от дна к вершине.
+       Пока представление не освобождено, размер массива менять нельзя (push и pop выбросят BufferError).
+       Это основной способ получить буфер стека: memoryview(стек) работает только начиная с Python 3.12.
+        """
+        return memoryview(self.stack_array)
+
+    def __buffer__(self, flags):
+        """
+       Протокол буфера для memoryview(стек) и bytes(стек) (PEP 688). Python до 3.12
+       этот метод не вызывает, поэтому там нужно использовать view().
+        """
+        return memoryview(self.stack_array)
+
+    def __release_buffer__(self, view):
+        view.release()
+
+
 class Queue:
     """
    Очередь — это коллекция, элементы которой получают по принципу «первый вошел, первый вышел»
+
+   Элементы хранятся в кольцевом буфере: индекс head указывает на первый элемент, а новые элементы
+   записываются за последним. Поэтому и добавление, и удаление выполняются за O(1),
+   без сдвига остальных элементов. Если емкость не задана, буфер при заполнении увеличивается вдвое.
     """
 
-    def __init__(self):
-        self.queue_list = []
+    def __init__(self, capacity: int = None, overflow: str = 'raise', typecode: str = None):
+        """
+        capacity - максимальное количество элементов (None - без ограничения);
+        overflow - что делать при добавлении в заполненную очередь:
+            'raise' - выбросить OverflowError, 'drop' - не добавлять новый элемент,
+            'overwrite' - удалить самый старый элемент и добавить новый;
+        typecode - код типа array.array (например, 'q' для целых чисел): элементы хранятся
+            в типизированном массиве фиксированной емкости, а не в списке объектов.
+        """
+        if overflow not in ('raise', 'drop', 'overwrite'):
+            raise ValueError("overflow должен быть 'raise', 'drop' или 'overwrite'")
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity должна быть не меньше 1")
+        if typecode is not None:
+            if capacity is None:
+                raise ValueError("Для типизированной очереди нужно задать capacity")
+            self._buffer = array(typecode, [0]) * capacity
+        else:
+            self._buffer = [None] * (8 if capacity is None else capacity)
+        self._capacity = capacity
+        self._overflow = overflow
+        self._head = 0  # индекс первого элемента
+        self._size = 0
 
     def __len__(self):
-        return len(self.queue_list)
+        return self._size
 
     def dequeue(self):
         """
         Удаляет первый помещенный элемент из очереди и возвращает его.
-        Поскольку мы вставляем элементы в начало списка, убирать мы их будем с конца.
         """
-        return self.queue_list.pop()
+        if not self._size:
+            raise IndexError("dequeue from empty queue")
+        buffer = self._buffer
+        value = buffer[self._head]
+        if isinstance(buffer, list):
+            buffer[self._head] = None  # не держим ссылку на удаленный объект
+        self._head = (self._head + 1) % len(buffer)
+        self._size -= 1
+        return value
 
     def enqueue(self, num: int):
         """
         Добавляет элемент в очередь
         """
-        self.queue_list.insert(0, num)
+        buffer = self._buffer
+        if self._size == len(buffer):
+            if self._capacity is None:
+                self._grow()
+                buffer = self._buffer
+            elif self._overflow == 'drop':
+                return
+            elif self._overflow == 'overwrite':
+                self.dequeue()
+            else:
+                raise OverflowError("queue is full")
+        buffer[(self._head + self._size) % len(buffer)] = num
+        self._size += 1
+
+    def _grow(self):
+        """
+        Увеличивает буфер вдвое, переписывая элементы по порядку с начала нового буфера.
+        """
+        buffer = self._buffer
+        head = self._head
+        self._buffer = buffer[head:] + buffer[:head] + [None] * len(buffer)
+        self._head = 0
+
+    @property
+    def capacity(self):
+        """
+        Максимальное количество элементов (None - очередь не ограничена)
+        """
+        return self._capacity
+
+    @property
+    def full(self):
+        """
+        True, если в ограниченной очереди не осталось места
+        """
+        return self._capacity is not None and self._size == self._capacity
+
+    @property
+    def queue_list(self):
+        """
+        Элементы очереди списком в прежнем порядке: от последнего добавленного к первому
+        """
+        buffer = self._buffer
+        return [buffer[(self._head + i) % len(buffer)] for i in range(self._size - 1, -1, -1)]
 
     @property
     def last_element(self):
         """
         Последний элемент в очереди
         """
-        return self.queue_list[0]
+        if not self._size:
+            raise IndexError("queue is empty")
+        return self._buffer[(self._head + self._size - 1) % len(self._buffer)]
 
     @property
     def first_element(self):
         """
         Первый элемент в очереди
         """
-        return self.queue_list[-1]
+        if not self._size:
+            raise IndexError("queue is empty")
+        return self._buffer[self._head]
+
+
+class _ConcurrentBuffer:
+    """
+   Общая часть потокобезопасных стека и очереди: блокировка, условия «не пусто» и «не полно»,
+   ожидание с таймаутом и пакетные операции. Конкретное хранилище задают наследники
+   через методы _put_item, _get_item и _size.
+    """
+
+    def __init__(self, maxsize: int = None):
+        """
+        maxsize - максимальное количество элементов; при заполнении put ждет, пока место освободится.
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize должен быть не меньше 1")
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
 
+    def __len__(self):
+        with self._lock:
+            return self._size()
+
+    def _wait(self, condition, predicate, block, timeout, error):
+        """
+        Ждет выполнения predicate под блокировкой; без блокировки или по таймауту выбрасывает ошибку.
+        """
+        if predicate():
+            return
+        if not block:
+            raise error
+        if not condition.wait_for(predicate, timeout):
+            raise TimeoutError
+
+    def _has_room(self):
+        return self._maxsize is None or self._size() < self._maxsize
+
+    def put(self, item, block: bool = True, timeout: float = None):
+        """
+        Добавляет элемент; если буфер заполнен, ждет освобождения места.
+        """
+        with self._lock:
+            self._wait(self._not_full, self._has_room, block, timeout, OverflowError("buffer is full"))
+            self._put_item(item)
+            self._not_empty.notify()
+
+    def get(self, block: bool = True, timeout: float = None):
+        """
+        Извлекает элемент; если буфер пуст, ждет появления элемента (не дольше timeout секунд).
+        """
+        with self._lock:
+            self._wait(self._not_empty, self._size, block, timeout, IndexError("buffer is empty"))
+            item = self._get_item()
+            self._not_full.notify()
+            return item
+
+    def push_many(self, items, block: bool = True, timeout: float = None):
+        """
+        Добавляет несколько элементов, захватывая блокировку один раз на каждую порцию,
+        которая помещается в буфер, и возвращает количество добавленных элементов.
+        Без блокировки элементы добавляются все сразу или ни одного (OverflowError).
+        timeout ограничивает общее время ожидания; если оно истекло, выбрасывается TimeoutError,
+        а количество уже добавленных элементов записано в его атрибут pushed.
+        """
+        items = list(items)
+        if not block:
+            with self._lock:
+                if self._maxsize is not None and self._size() + len(items) > self._maxsize:
+                    raise OverflowError("buffer is full")
+                for item in items:
+                    self._put_item(item)
+                self._not_empty.notify_all()
+            return len(items)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        start = 0
+        while start < len(items):
+            with self._lock:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    self._wait(self._not_full, self._has_room, True, remaining, None)
+                except TimeoutError as error:
+                    error.pushed = start
+                    raise
+                room = len(items) - start if self._maxsize is None else self._maxsize - self._size()
+                for item in items[start:start + room]:
+                    self._put_item(item)
+                start += room
+                self._not_empty.notify_all()
+        return start
+
+    def pop_many(self, n: int, block: bool = True, timeout: float = None):
+        """
+        Извлекает до n элементов за один захват блокировки. Ждет, только если буфер пуст.
+        """
+        with self._lock:
+            self._wait(self._not_empty, self._size, block, timeout, IndexError("buffer is empty"))
+            items = [self._get_item() for _ in range(min(n, self._size()))]
+            self._not_full.notify_all()
+            return items
+
+
+class ConcurrentStack(_ConcurrentBuffer):
+    """
+   Потокобезопасный стек для передачи данных между потоками: pop ждет, пока в стеке появится элемент.
+    """
+
+    def __init__(self, maxsize: int = None):
+        super().__init__(maxsize)
+        self.stack_list = []
+
+    def _size(self):
+        return len(self.stack_list)
+
+    def _put_item(self, item):
+        self.stack_list.append(item)
+
+    def _get_item(self):
+        return self.stack_list.pop()
+
+    push = _ConcurrentBuffer.put
+    pop = _ConcurrentBuffer.get
+
+
+class ConcurrentQueue(_ConcurrentBuffer):
+    """
+   Потокобезопасная очередь на кольцевом буфере Queue: get ждет элемент, а put при заданном maxsize
+   ждет свободного места, поэтому быстрые производители не переполняют память.
+    """
+
+    def __init__(self, maxsize: int = None):
+        super().__init__(maxsize)
+        self._queue = Queue()
+
+    def _size(self):
+        return len(self._queue)
+
+    def _put_item(self, item):
+        self._queue.enqueue(item)
+
+    def _get_item(self):
+        return self._queue.dequeue()
+
+    enqueue = _ConcurrentBuffer.put
+    dequeue = _ConcurrentBuffer.get
+
+
+class _AsyncBuffer:
+    """
+   Общая часть стека и очереди для asyncio: get и put - сопрограммы. Если задан maxsize,
+   put приостанавливает производителя, пока потребитель не освободит место (обратное давление).
+    """
+
+    def __init__(self, maxsize: int = None):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize должен быть не меньше 1")
+        self._maxsize = maxsize
+        self._changed = None  # asyncio.Condition создается внутри работающего цикла событий
+
+    def __len__(self):
+        return self._size()
+
+    def _condition(self):
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    def _has_room(self):
+        return self._maxsize is None or self._size() < self._maxsize
+
+    async def put(self, item):
+        """
+        Добавляет элемент, дожидаясь свободного места.
+        """
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(self._has_room)
+            self._put_item(item)
+            changed.notify_all()
+
+    async def get(self):
+        """
+        Извлекает элемент, дожидаясь его появления.
+        """
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(self._size)
+            item = self._get_item()
+            changed.notify_all()
+            return item
+
+    async def push_many(self, items):
+        """
+        Добавляет несколько элементов порциями, которые помещаются в буфер,
+        и возвращает количество добавленных элементов.
+        """
+        items = list(items)
+        start = 0
+        changed = self._condition()
+        while start < len(items):
+            async with changed:
+                await changed.wait_for(self._has_room)
+                room = len(items) - start if self._maxsize is None else self._maxsize - self._size()
+                for item in items[start:start + room]:
+                    self._put_item(item)
+                start += room
+                changed.notify_all()
+        return start
+
+    async def pop_many(self, n: int):
+        """
+        Извлекает до n элементов, дожидаясь хотя бы одного.
+        """
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(self._size)
+            items = [self._get_item() for _ in range(min(n, self._size()))]
+            changed.notify_all()
+            return items
+
+
+class AsyncStack(_AsyncBuffer):
+    """
+   Стек для сопрограмм asyncio
+    """
+
+    def __init__(self, maxsize: int = None):
+        super().__init__(maxsize)
+        self.stack_list = []
+
+    def _size(self):
+        return len(self.stack_list)
+
+    def _put_item(self, item):
+        self.stack_list.append(item)
+
+    def _get_item(self):
+        return self.stack_list.pop()
+
+    push = _AsyncBuffer.put
+    pop = _AsyncBuffer.get
+
+
+class AsyncQueue(_AsyncBuffer):
+    """
+   Очередь для сопрограмм asyncio на кольцевом буфере Queue
+    """
+
+    def __init__(self, maxsize: int = None):
+        super().__init__(maxsize)
+        self._queue = Queue()
+
+    def _size(self):
+        return len(self._queue)
+
+    def _put_item(self, item):
+        self._queue.enqueue(item)
+
+    def _get_item(self):
+        return self._queue.dequeue()
+
+    enqueue = _AsyncBuffer.put
+    dequeue = _AsyncBuffer.get
+
+
+def _benchmark_queue(n=100_000):
+    """
+    Сравнивает кольцевой буфер с прежней реализацией очереди на списке (insert(0, ...) и pop()).
+    """
+    class ListQueue:
+        def __init__(self):
+            self.queue_list = []
+
+        def enqueue(self, num):
+            self.queue_list.insert(0, num)
+
+        def dequeue(self):
+            return self.queue_list.pop()
+
+    def fill_and_drain(queue):
+        for i in range(n):
+            queue.enqueue(i)
+        for _ in range(n):
+            queue.dequeue()
+
+    for name, factory in (('список', ListQueue), ('кольцевой буфер', Queue),
+                          ('типизированный буфер', lambda: Queue(n, typecode='q'))):
+        seconds = min(timeit.repeat(lambda: fill_and_drain(factory()), number=1, repeat=3))
+        print(f"{name}: {n} элементов за {seconds:.3f} с")
+
+
+def _benchmark_concurrent(producers=4, consumers=4, n=100_000, batch=100):
+    """
+   Пропускная способность потокобезопасных и асинхронных буферов при нескольких производителях и потребителях.
+   Каждый производитель кладет n // producers элементов, потребители забирают их, пока не получат все.
+    """
+    per_producer = n // producers
+    total = per_producer * producers
+
+    def run_threads(buffer, batched):
+        taken = [0] * consumers
+
+        def produce():
+            if batched:
+                for start in range(0, per_producer, batch):
+                    buffer.push_many(range(start, min(start + batch, per_producer)))
+            else:
+                for i in range(per_producer):
+                    buffer.put(i)
+
+        def consume(number):
+            while sum(taken) < total:
+                try:
+                    got = len(buffer.pop_many(batch, timeout=0.05)) if batched else \
+                        (buffer.get(timeout=0.05) is not None)
+                except TimeoutError:
+                    continue
+                taken[number] += got
+
+        threads = [threading.Thread(target=produce) for _ in range(producers)]
+        threads += [threading.Thread(target=consume, args=(i,)) for i in range(consumers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    async def run_async(buffer):
+        async def produce():
+            for start in range(0, per_producer, batch):
+                await buffer.push_many(range(start, min(start + batch, per_producer)))
+
+        async def consume():
+            nonlocal taken
+            while True:
+                taken += len(await buffer.pop_many(batch))
+                if taken == total:
+                    done.set()
+
+        taken = 0
+        done = asyncio.Event()
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(consume()) for _ in range(consumers)]
+        await asyncio.gather(*[produce() for _ in range(producers)])
+        await done.wait()
+        seconds = time.perf_counter() - start
+        for task in tasks:  # Оставшиеся потребители ждут элементов, которых уже не будет
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return seconds
+
+    for name, factory in (('ConcurrentQueue', lambda: ConcurrentQueue(maxsize=1000)),
+                          ('ConcurrentStack', lambda: ConcurrentStack(maxsize=1000))):
+        for batched in (False, True):
+            seconds = run_threads(factory(), batched)
+            mode = 'пакетами' if batched else 'по одному'
+            print(f"{name} ({producers}x{consumers}, {mode}): {total / seconds:,.0f} элементов/с")
+    for name, factory in (('AsyncQueue', lambda: AsyncQueue(maxsize=1000)),
+                          ('AsyncStack', lambda: AsyncStack(maxsize=1000))):
+        seconds = asyncio.run(run_async(factory()))
+        print(f"{name} ({producers}x{consumers}, пакетами): {total / seconds:,.0f} элементов/с")
+
+
+def _benchmark_typed_stack(n=1_000_000):
+    """
+   Сравнивает память стека на списке и TypedStack с разными типами элементов.
+    """
+    stack = Stack()
+    for i in range(n):
+        stack.push(i + 1000)  # числа больше 256 не берутся из кэша маленьких целых
+    list_bytes = sys.getsizeof(stack.stack_list) + sum(sys.getsizeof(x) for x in stack.stack_list)
+    print(f"Stack на списке: {list_bytes / n:.1f} байт на элемент")
+    for typecode in ('q', 'i'):
+        typed = TypedStack(typecode)
+        typed.push_many(range(1000, n + 1000))
+        typed_bytes = sys.getsizeof(typed.stack_array)
+        print(f"TypedStack('{typecode}'): {typed_bytes / n:.1f} байт на элемент, "
+              f"в {list_bytes / typed_bytes:.1f} раза меньше")
 
 
+if __name__ == "__main__":
+    _benchmark_queue()
+    _benchmark_typed_stack()
+    _benchmark_concurrent()
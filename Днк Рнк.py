@@ -1,11 +1,398 @@
 """Класс "Последовательность" будет являться базовым классом для классов
 "ДНК", "РНК" и "Белок".В нем будут реализованы общие
-свойства и методы для всех последовательностей."""
+свойства и методы для всех последовательностей.
+
+Последовательность ДНК или РНК можно хранить в упакованном виде (упаковать=True):
+каждое основание кодируется 2 битами (A=0, C=1, G=2, T/U=3), 4 основания в одном байте.
+Символы не из алфавита (например, N) хранятся отдельно списком участков, поэтому
+исходная строка восстанавливается без изменений. Длина, статистика, срезы и перебор
+работают прямо с упакованными байтами, не собирая всю строку целиком."""
+
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate, repeat
+from operator import add, mul, ne, sub
+
+БЛОК = 1 << 20  # сколько оснований упаковывается или распаковывается за один раз
+КУСОК_KMER = 1 << 22  # сколько k-меров считает один процесс за одно задание
+
+# Таблицы для bytes.translate: i-е основание байта -> код 0..3 и код 0..3 -> i-е основание байта
+_ИЗВЛЕЧЬ = [bytes((x >> 2 * i) & 3 for x in range(256)) for i in range(4)]
+_ПОМЕСТИТЬ = [bytes((x & 3) << 2 * i for x in range(256)) for i in range(4)]
+
+
+@lru_cache(maxsize=None)
+def _таблицы_кодов(коды):
+    """Таблицы перевода букв алфавита в коды 0..3 и обратно для bytes.translate."""
+    в_коды = bytearray(256)
+    из_кодов = bytearray(256)
+    for код, буква in enumerate(коды):
+        в_коды[ord(буква)] = код
+        из_кодов[код] = ord(буква)
+    return bytes(в_коды), bytes(из_кодов)
+
+
+@lru_cache(maxsize=None)
+def _таблица_перевода(источник, цель):
+    """Таблица str.translate для всех символов ASCII: буквы источника заменяются буквами цели,
+    а все остальные символы - нулевым символом, который потом удаляется."""
+    замены = dict(zip(источник, цель))
+    return str.maketrans({chr(x): замены.get(chr(x), "\0") for x in range(128)})
+
+
+def _перевести(строка, источник, цель):
+    """Заменяет каждую букву источника соответствующей буквой цели, а остальные символы отбрасывает.
+    Работает за один проход str.translate вместо цепочки if/elif и сложения строк:
+    для строк из ASCII и таблицы из ASCII в ASCII translate выполняется без вызовов Python на символ."""
+    if not строка.isascii():  # символы вне ASCII все равно отбрасываются; убираем их заранее
+        строка = re.sub(f"[^{источник}]", "", строка)
+    результат = строка.translate(_таблица_перевода(источник, цель))
+    if "\0" in результат:
+        результат = результат.replace("\0", "")
+    return результат
+
+
+@lru_cache(maxsize=None)
+def _байтовый_перевод(источник, цель):
+    """Таблица bytes.translate (буквы источника -> буквы цели) и байты, которые нужно удалить
+    (все, кроме букв источника)."""
+    return bytes.maketrans(источник.encode(), цель.encode()), bytes(set(range(256)) - set(источник.encode()))
+
+
+# Таблица генетического кода строится один раз при загрузке модуля
+ТАБЛИЦА_ТРАНСЛЯЦИИ = {
+    "UUU": "Фенилаланин",
+    "UUC": "Фенилаланин",
+    "UUA": "Лейцин",
+    "UUG": "Лейцин",
+    "UCU": "Серин",
+    "UCC": "Серин",
+    "UCA": "Серин",
+    "UCG": "Серин",
+    "UAU": "Тирозин",
+    "UAC": "Тирозин",
+    "UAA": "Стоп",
+    "UAG": "Стоп",
+    "UGU": "Цистеин",
+    "UGC": "Цистеин",
+    "UGA": "Стоп",
+    "UGG": "Триптофан",
+    "CUU": "Лейцин",
+    "CUC": "Лейцин",
+    "CUA": "Лейцин",
+    "CUG": "Лейцин",
+    "CCU": "Пролин",
+    "CCC": "Пролин",
+    "CCA": "Пролин",
+    "CCG": "Пролин",
+    "CAU": "Гистидин",
+    "CAC": "Гистидин",
+    "CAA": "Глутамин",
+    "CAG": "Глутамин",
+    "CGU": "Аргинин",
+    "CGC": "Аргинин",
+    "CGA": "Аргинин",
+    "CGG": "Аргинин",
+    "AUU": "Изолейцин",
+    "AUC": "Изолейцин",
+    "AUA": "Изолейцин",
+    "AUG": "Метионин",
+    "ACU": "Треонин",
+    "ACC": "Треонин",
+    "ACA": "Треонин",
+    "ACG": "Треонин",
+    "AAU": "Аспарагин",
+    "AAC": "Аспарагин",
+    "AAA": "Лизин",
+    "AAG": "Лизин",
+    "AGU": "Серин",
+    "AGC": "Серин",
+    "AGA": "Аргинин",
+    "AGG": "Аргинин",
+    "GUU": "Валин",
+    "GUC": "Валин",
+    "GUA": "Валин",
+    "GUG": "Валин",
+    "GCU": "Аланин",
+    "GCC": "Аланин",
+    "GCA": "Аланин",
+    "GCG": "Аланин",
+    "GAU": "Аспарагиновая кислота",
+    "GAC": "Аспарагиновая кислота",
+    "GAA": "Глутаминовая кислота",
+    "GAG": "Глутаминовая кислота",
+    "GGU": "Глицин",
+    "GGC": "Глицин",
+    "GGA": "Глицин",
+    "GGG": "Глицин"
+}
+
+# Однобуквенные и трехбуквенные обозначения аминокислот ("*" - стоп-кодон)
+ОДНОБУКВЕННЫЕ_КОДЫ = {
+    "Фенилаланин": "F", "Лейцин": "L", "Серин": "S", "Тирозин": "Y", "Стоп": "*",
+    "Цистеин": "C", "Триптофан": "W", "Пролин": "P", "Гистидин": "H", "Глутамин": "Q",
+    "Аргинин": "R", "Изолейцин": "I", "Метионин": "M", "Треонин": "T", "Аспарагин": "N",
+    "Лизин": "K", "Валин": "V", "Аланин": "A", "Аспарагиновая кислота": "D",
+    "Глутаминовая кислота": "E", "Глицин": "G",
+}
+ТРЕХБУКВЕННЫЕ_КОДЫ = {
+    "F": "Phe", "L": "Leu", "S": "Ser", "Y": "Tyr", "*": "Stop", "C": "Cys", "W": "Trp",
+    "P": "Pro", "H": "His", "Q": "Gln", "R": "Arg", "I": "Ile", "M": "Met", "T": "Thr",
+    "N": "Asn", "K": "Lys", "V": "Val", "A": "Ala", "D": "Asp", "E": "Glu", "G": "Gly",
+}
+НАЗВАНИЯ_ПО_КОДУ = {буква: название for название, буква in ОДНОБУКВЕННЫЕ_КОДЫ.items()}
+
+# Средние массы звеньев цепи (г/моль): нуклеотидов в составе ДНК и РНК и остатков аминокислот.
+# Масса молекулы - сумма масс звеньев плюс поправка на концы цепи (см. _поправка_массы в классах).
+МАССЫ_ДНК = {"A": 313.21, "C": 289.18, "G": 329.21, "T": 304.2}
+МАССЫ_РНК = {"A": 329.21, "C": 305.18, "G": 345.21, "U": 306.17}
+МАССЫ_АМИНОКИСЛОТ = {
+    "A": 71.0788, "R": 156.1875, "N": 114.1038, "D": 115.0886, "C": 103.1388,
+    "E": 129.1155, "Q": 128.1307, "G": 57.0519, "H": 137.1411, "I": 113.1594,
+    "L": 113.1594, "K": 128.1741, "M": 131.1926, "F": 147.1766, "P": 97.1167,
+    "S": 87.0782, "T": 101.1051, "W": 186.2132, "Y": 163.176, "V": 99.1326,
+}
+# Вырожденные обозначения оснований IUPAC (для РНК T заменяется на U)
+ВЫРОЖДЕННЫЕ_ОСНОВАНИЯ = {
+    "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT", "M": "AC",
+    "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT",
+}
+# Текст для индекса поиска: строчные латинские буквы становятся прописными, а нулевой символ
+# (он служит концом текста) - символом \x01; символы вне ASCII тоже заменяются на \x01
+_ТАБЛИЦА_ИНДЕКСА = str.maketrans({**{chr(код): chr(код).upper() for код in range(ord("a"), ord("z") + 1)}, "\0": "\x01"})
+МАСШТАБ_МАСС = 10000  # массы хранятся целыми числами в десятитысячных долях, чтобы суммы были точными
+
+# Кодон переводится в число 0..63: 2 бита на основание (A=0, C=1, G=2, U=3), первое основание - старшее.
+# Для каждой из трех позиций кодона своя таблица: код основания уже умножен на 16, 4 или 1,
+# а любой символ не из алфавита дает 64, поэтому сумма трех байтов не больше 192 (без переноса),
+# и любой кодон с таким символом получает номер не меньше 64.
+_ПОЗИЦИИ_КОДОНА = []
+for _множитель in (16, 4, 1):
+    _таблица = bytearray([64]) * 256
+    for _код, _буква in enumerate("ACGU"):
+        _таблица[ord(_буква)] = _код * _множитель
+    _ПОЗИЦИИ_КОДОНА.append(bytes(_таблица))
+# Номер кодона -> однобуквенный код аминокислоты ("?" - кодон с символом не из алфавита)
+_АМИНОКИСЛОТА_ПО_НОМЕРУ = bytearray(b"?" * 256)
+for _кодон, _название in ТАБЛИЦА_ТРАНСЛЯЦИИ.items():
+    _номер = sum(_ПОЗИЦИИ_КОДОНА[i][ord(_буква)] for i, _буква in enumerate(_кодон))
+    _АМИНОКИСЛОТА_ПО_НОМЕРУ[_номер] = ord(ОДНОБУКВЕННЫЕ_КОДЫ[_название])
+_АМИНОКИСЛОТА_ПО_НОМЕРУ = bytes(_АМИНОКИСЛОТА_ПО_НОМЕРУ)
+_КОМПЛЕМЕНТ_С_ДЛИНОЙ = str.maketrans("AUGC", "UACG")  # символы не из алфавита остаются на месте
+
+
+def _транслировать_рамку(рнк, сдвиг):
+    """Однобуквенная трансляция всех полных кодонов, начиная с позиции сдвиг, без остановки на стопе.
+    Номера кодонов считаются сразу для всей рамки: три среза с шагом 3 переводятся таблицами
+    _ПОЗИЦИИ_КОДОНА и складываются как большие числа (байты не переполняются)."""
+    if not рнк.isascii():  # символы вне ASCII заменяем символом, которого нет в алфавите
+        рнк = re.sub(r"[^\x00-\x7f]", "N", рнк)
+    байты = рнк.encode("ascii")
+    количество = (len(байты) - сдвиг) // 3 if len(байты) > сдвиг else 0
+    if not количество:
+        return ""
+    номера = 0
+    for позиция in range(3):
+        часть = байты[сдвиг + позиция::3][:количество].translate(_ПОЗИЦИИ_КОДОНА[позиция])
+        номера += int.from_bytes(часть, "little")
+    return номера.to_bytes(количество, "little").translate(_АМИНОКИСЛОТА_ПО_НОМЕРУ).decode("ascii")
+
+
+@lru_cache(maxsize=None)
+def _веса_масс(тип):
+    """Массы символов класса тип в десятитысячных долях г/моль; символы не из таблицы
+    (например, N или X) получают среднюю массу звена."""
+    среднее = round(sum(тип.массы.values()) / len(тип.массы) * МАСШТАБ_МАСС)
+    return defaultdict(lambda: среднее, {символ: round(масса * МАСШТАБ_МАСС) for символ, масса in тип.массы.items()})
+
+
+def _коды_окон(значения, k, бит=2):
+    """Упакованные коды всех окон длины k в array('Q'): значения - байты с числами меньше 2**бит,
+    первое значение окна - старшие биты кода (k * бит не больше 64).
+    Каждое значение кладется в свою 64-битную ячейку одного большого числа, и коды
+    считаются сразу для всех позиций сдвигами и сложениями этого числа: код длины 2m -
+    код длины m, сдвинутый на m * бит, плюс код длины m из ячейки на m позиций правее.
+    Код длины k собирается из таких блоков по двоичной записи k, поэтому операций
+    над большим числом O(log k), и для каждой позиции получается одно целое число."""
+    количество = len(значения) - k + 1
+    ячейки = bytearray(8 * len(значения))
+    ячейки[::8] = значения
+    блок, длина_блока = int.from_bytes(ячейки, "little"), 1
+    код, длина_кода = 0, 0
+    while длина_блока <= k:
+        if k & длина_блока:
+            код = (код << бит * длина_блока) + (блок >> 64 * длина_кода)
+            длина_кода += длина_блока
+        if 2 * длина_блока <= k:
+            блок = (блок << бит * длина_блока) + (блок >> 64 * длина_блока)
+        длина_блока *= 2
+    коды = array("Q")
+    коды.frombytes(код.to_bytes(len(ячейки), "little")[:8 * количество])
+    return коды
+
+
+def _спектр_куска(кусок, k, коды):
+    """Спектр k-меров одного куска: {упакованный k-мер: количество}.
+    k-меры с символами не из алфавита пропускаются: кусок делится на участки без них.
+    Участок обрабатывается частями по БЛОК k-меров (соседние части перекрываются на k-1 основание),
+    и упакованные коды каждой части считаются в Counter без цикла на Python."""
+    в_коды, _ = _таблицы_кодов(коды)
+    спектр = Counter()
+    for участок in re.split(f"[^{коды}]+", кусок):
+        for начало in range(0, len(участок) - k + 1, БЛОК):
+            спектр.update(_коды_окон(участок[начало:начало + БЛОК + k - 1].encode("ascii").translate(в_коды), k))
+    return спектр
+
 
 class Последовательность:
-    def __init__(self, последовательность):
+    коды = None  # буквы, соответствующие 2-битным кодам 0..3 (задаются в ДНК и РНК)
+    имя = None  # имя записи, если последовательность прочитана из файла
+    массы = None  # массы звеньев цепи по символам (задаются в подклассах)
+    _поправка_массы = 0.0
+    _состав = None  # результат статистики, запоминается до изменения последовательности
+    _индекс_поиска = None  # ИндексПоиска, строится при первом поиске
+    _вид = None  # участок отображенного в память файла, из которого строка еще не собрана
+
+    def __init__(self, последовательность, упаковать=False):
+        if упаковать and self.коды is None:
+            raise ValueError("Упаковать можно только последовательность ДНК или РНК")
+        self._упакована = упаковать
         self.последовательность = последовательность
 
+    @property
+    def последовательность(self):
+        if not self._упакована:
+            return self._текст()
+        return self._распаковать(0, self._длина)
+
+    @последовательность.setter
+    def последовательность(self, значение):
+        self._вид = None
+        self._состав = None
+        self._индекс_поиска = None
+        if self._упакована:
+            self._упаковать(значение)
+        else:
+            self._строка = значение
+
+    @classmethod
+    def _из_вида(cls, вид, имя=None):
+        """Последовательность над участком файла (memoryview) без копирования.
+        Строка собирается из участка (без переводов строк) только при первом обращении к ней."""
+        объект = cls.__new__(cls)
+        объект._упакована = False
+        объект._строка = None
+        объект._вид = вид
+        объект.имя = имя
+        return объект
+
+    def _текст(self):
+        if self._вид is not None:
+            self._строка = bytes(self._вид).translate(None, b"\r\n").decode("latin-1")
+            self._вид = None
+        return self._строка
+
+    @property
+    def упакована(self):
+        return self._упакована
+
+    def _упаковать(self, строка):
+        """Упаковывает строку по 4 основания в байт, запоминая участки с символами не из алфавита."""
+        коды = self.коды
+        в_коды, _ = _таблицы_кодов(коды)
+        self._длина = len(строка)
+        # Участки из символов не из алфавита: (начало, текст); в упакованных байтах на их месте код 0
+        self._неизвестные = [(m.start(), m.group()) for m in re.finditer(f"[^{коды}]+", строка)]
+        self._начала_неизвестных = [начало for начало, _ in self._неизвестные]
+        упакованная = bytearray()
+        for начало in range(0, len(строка), БЛОК):
+            кусок = строка[начало:начало + БЛОК]
+            if self._неизвестные:
+                кусок = re.sub(f"[^{коды}]", коды[0], кусок)
+            байты = кусок.encode("ascii").translate(в_коды)
+            байты += bytes(-len(байты) % 4)  # дополняем до целого числа байтов кодом 0
+            # Основания с номерами 4k, 4k+1, 4k+2, 4k+3 сдвигаются на свои 2 бита и складываются:
+            # сложение больших чисел из байтов работает как поразрядное ИЛИ всех байтов сразу
+            число = 0
+            for i in range(4):
+                число |= int.from_bytes(байты[i::4].translate(_ПОМЕСТИТЬ[i]), "little")
+            упакованная += число.to_bytes(len(байты) // 4, "little")
+        self._упакованная = bytes(упакованная)
+
+    def _распаковать(self, начало, конец):
+        """Возвращает строку с основаниями с номерами от начало до конец (не включая) из упакованных байтов."""
+        if начало >= конец:
+            return ""
+        _, из_кодов = _таблицы_кодов(self.коды)
+        части = []
+        for блок in range(начало, конец, БЛОК):
+            первый_байт = блок // 4
+            байты = self._упакованная[первый_байт:(min(блок + БЛОК, конец) + 3) // 4]
+            основания = bytearray(4 * len(байты))
+            for i in range(4):
+                основания[i::4] = байты.translate(_ИЗВЛЕЧЬ[i])
+            сдвиг = блок - 4 * первый_байт
+            части.append(основания[сдвиг:сдвиг + min(БЛОК, конец - блок)].translate(из_кодов).decode("ascii"))
+        результат = "".join(части)
+        if not self._неизвестные:
+            return результат
+        # Возвращаем на место символы не из алфавита, попадающие в нужный диапазон
+        куски = []
+        позиция = начало
+        номер = max(bisect_right(self._начала_неизвестных, начало) - 1, 0)
+        for участок_начало, текст in self._неизвестные[номер:]:
+            if участок_начало >= конец:
+                break
+            участок_конец = участок_начало + len(текст)
+            if участок_конец <= начало:
+                continue
+            левый, правый = max(участок_начало, начало), min(участок_конец, конец)
+            куски.append(результат[позиция - начало:левый - начало])
+            куски.append(текст[левый - участок_начало:правый - участок_начало])
+            позиция = правый
+        куски.append(результат[позиция - начало:])
+        return "".join(куски)
+
+    def _перевести(self, источник, цель):
+        """Перевод всей последовательности (см. _перевести); упакованная распаковывается блоками."""
+        if not self._упакована:
+            return _перевести(self._текст(), источник, цель)
+        return "".join(_перевести(self._распаковать(начало, min(начало + БЛОК, self._длина)), источник, цель)
+                       for начало in range(0, self._длина, БЛОК))
+
+    def __len__(self):
+        return self.длина()
+
+    def __getitem__(self, индекс):
+        if not self._упакована:
+            if isinstance(индекс, slice):
+                return type(self)(self._текст()[индекс])
+            return self._текст()[индекс]
+        if isinstance(индекс, slice):
+            начало, конец, шаг = индекс.indices(self._длина)
+            if шаг == 1:
+                return type(self)(self._распаковать(начало, конец), упаковать=True)
+            return type(self)(self.последовательность[индекс], упаковать=True)
+        if индекс < 0:
+            индекс += self._длина
+        if not 0 <= индекс < self._длина:
+            raise IndexError("индекс вне последовательности")
+        return self._распаковать(индекс, индекс + 1)
+
+    def __iter__(self):
+        if not self._упакована:
+            yield from self._текст()
+            return
+        for начало in range(0, self._длина, БЛОК):
+            yield from self._распаковать(начало, min(начало + БЛОК, self._длина))
+
     def алфавит(self):
         pass
 
@@ -13,25 +400,150 @@ class Последовательность:
         pass
 
     def длина(self):
-        return len(self.последовательность)
+        if self._упакована:
+            return self._длина
+        if self._вид is not None:  # длину участка файла считаем без сборки строки: блоками по БЛОК байт
+            вид = self._вид
+            return sum(len(bytes(вид[i:i + БЛОК]).translate(None, b"\r\n")) for i in range(0, len(вид), БЛОК))
+        return len(self._строка)
 
     def статистика(self):
-        статистика = {}
-        for символ in self.последовательность:
-            if символ in статистика:
-                статистика[символ] += 1
+        if self._состав is None:
+            if self._упакована:
+                self._состав = self._статистика_упакованной()
             else:
-                статистика[символ] = 1
-        return статистика
+                # Символы в порядке первого появления, и для каждого - str.count по всей строке
+                текст = self._текст()
+                self._состав = {символ: текст.count(символ) for символ in dict.fromkeys(текст)}
+        return dict(self._состав)
+
+    def _статистика_упакованной(self):
+        """Подсчет оснований прямо по упакованным байтам: для каждой из 4 позиций в байте - bytes.count."""
+        счетчики = [0, 0, 0, 0]
+        for i in range(4):
+            позиция = self._упакованная.translate(_ИЗВЛЕЧЬ[i])
+            for код in range(4):
+                счетчики[код] += позиция.count(код)
+        счетчики[0] -= -self._длина % 4  # дополнение в последнем байте
+        статистика = {буква: количество for буква, количество in zip(self.коды, счетчики)}
+        for _, текст in self._неизвестные:  # на месте этих символов упакован код 0
+            статистика[self.коды[0]] -= len(текст)
+            for символ in текст:
+                статистика[символ] = статистика.get(символ, 0) + 1
+        # Как и для строки, символы перечисляются в порядке их первого появления
+        порядок = []
+        for начало in range(0, self._длина, БЛОК):
+            кусок = self._распаковать(начало, min(начало + БЛОК, self._длина))
+            порядок.extend(символ for символ in dict.fromkeys(кусок) if символ not in порядок)
+            if len(порядок) == sum(1 for количество in статистика.values() if количество):
+                break
+        return {символ: статистика[символ] for символ in порядок}
+
+    def _участок(self, начало, конец):
+        if self._упакована:
+            return self._распаковать(начало, конец)
+        return self._текст()[начало:конец]
+
+    def доля_gc(self):
+        длина = self.длина()
+        статистика = self.статистика()
+        return (статистика.get("G", 0) + статистика.get("C", 0)) / длина if длина else 0.0
+
+    def _блоки_окон(self, окно, шаг):
+        """Окна длины окно, сдвигаемые на шаг, по блокам: (текст блока, начала окон в блоке).
+        Каждое окно целиком попадает в свой блок, блоки длиной около БЛОК."""
+        if окно <= 0 or шаг <= 0:
+            raise ValueError("Окно и шаг должны быть положительными")
+        длина = self.длина()
+        начало = 0
+        while начало + окно <= длина:
+            текст = self._участок(начало, min(начало + БЛОК + окно, длина))
+            количество = (len(текст) - окно) // шаг + 1
+            yield текст, range(0, количество * шаг, шаг)
+            начало += количество * шаг
+
+    def окна_gc(self, окно, шаг=None):
+        """Доля G и C в окнах длины окно, сдвигаемых на шаг (по умолчанию окна не перекрываются).
+        В блоке окна считаются через str.count без срезов."""
+        доли = []
+        for текст, начала in self._блоки_окон(окно, шаг or окно):
+            for левый in начала:
+                правый = левый + окно
+                доли.append((текст.count("G", левый, правый) + текст.count("C", левый, правый)) / окно)
+        return доли
+
+    def спектр_kmer(self, k, процессов=None):
+        """Количество каждого k-мера (k от 1 до 31) в виде {упакованный k-мер: количество}:
+        k-мер упакован в число по 2 бита на основание, первое основание - старшие биты.
+        Длинная последовательность делится на куски по КУСОК_KMER k-меров (соседние куски
+        перекрываются на k-1 основание), куски считаются в пуле процессов, частичные спектры складываются."""
+        if self.коды is None:
+            raise ValueError("Спектр k-меров считается только для ДНК или РНК")
+        if not 1 <= k <= 31:
+            raise ValueError("k должно быть от 1 до 31")
+        длина = self.длина()
+        куски = (self._участок(начало, min(начало + КУСОК_KMER + k - 1, длина))
+                 for начало in range(0, длина - k + 1, КУСОК_KMER))
+        спектр = Counter()
+        if процессов == 1 or длина <= КУСОК_KMER:
+            for кусок in куски:
+                спектр.update(_спектр_куска(кусок, k, self.коды))
+            return спектр
+        with ProcessPoolExecutor(max_workers=процессов) as пул:
+            for часть in пул.map(_спектр_куска, куски, repeat(k), repeat(self.коды)):
+                спектр.update(часть)
+        return спектр
+
+    def kmer(self, код, k):
+        """Строка k-мера по его упакованному коду из спектр_kmer."""
+        return "".join(self.коды[(код >> 2 * (k - 1 - i)) & 3] for i in range(k))
+
+    def индекс_поиска(self):
+        # Индекс строится один раз и запоминается до изменения последовательности
+        if self._индекс_поиска is None:
+            self._индекс_поиска = ИндексПоиска(self)
+        return self._индекс_поиска
+
+    def найти(self, мотив):
+        # Позиции всех вхождений мотива (можно с вырожденными основаниями IUPAC), по возрастанию
+        return self.индекс_поиска().позиции(мотив)
+
+    def количество_вхождений(self, мотив):
+        return self.индекс_поиска().количество(мотив)
 
     def молекулярная_масса(self):
-        pass
+        # Сумма масс звеньев по запомненной статистике, поэтому повторный вызов не перебирает цепь
+        if self.массы is None:
+            raise ValueError("Масса считается только для ДНК, РНК или белка")
+        состав = self.статистика()
+        if not состав:
+            return 0.0
+        веса = _веса_масс(type(self))
+        return sum(веса[символ] * количество for символ, количество in состав.items()) / МАСШТАБ_МАСС \
+            + self._поправка_массы
+
+    def массы_окон(self, окно, шаг=None):
+        """Молекулярная масса каждого окна длины окно, сдвигаемого на шаг (по умолчанию 1).
+        Для блока один раз считаются префиксные суммы масс, масса окна - разность двух сумм."""
+        if self.массы is None:
+            raise ValueError("Масса считается только для ДНК, РНК или белка")
+        веса = _веса_масс(type(self))
+        массы = []
+        for текст, начала in self._блоки_окон(окно, шаг or 1):
+            суммы = list(accumulate(map(веса.__getitem__, текст), initial=0))
+            массы.extend((суммы[левый + окно] - суммы[левый]) / МАСШТАБ_МАСС + self._поправка_массы
+                         for левый in начала)
+        return массы
 
 """Класс "ДНК"  наследуется от класса "Последовательность"
 и реализует свои уникальные методы: возврат комплементарной
 последовательности и транскрипция ДНК в РНК"""
 
 class ДНК(Последовательность):
+    коды = "ACGT"
+    массы = МАССЫ_ДНК
+    _поправка_массы = -61.96  # одноцепочечная ДНК: без фосфата на 5'-конце
+
     def алфавит(self):
         return "ATCG"
 
@@ -39,30 +551,16 @@ class ДНК(Последовательность):
         return "ДНК"
 
     def комплементарная_последовательность(self):
-        комплементарная_последовательность = ""
-        for символ in self.последовательность:
-            if символ == "A":
-                комплементарная_последовательность += "T"
-            elif символ == "T":
-                комплементарная_последовательность += "A"
-            elif символ == "C":
-                комплементарная_последовательность += "G"
-            elif символ == "G":
-                комплементарная_последовательность += "C"
-        return комплементарная_последовательность
+        # A <-> T, C <-> G; символы не из алфавита отбрасываются
+        return self._перевести("ATCG", "TAGC")
+
+    def обратная_комплементарная_последовательность(self):
+        # Комплементарная цепь, прочитанная в обратном направлении (от 5' к 3')
+        return self.комплементарная_последовательность()[::-1]
 
     def транскрипция(self):
-        РНК_последовательность = ""
-        for символ in self.последовательность:
-            if символ == "A":
-                РНК_последовательность += "U"
-            elif символ == "T":
-                РНК_последовательность += "A"
-            elif символ == "C":
-                РНК_последовательность += "G"
-            elif символ == "G":
-                РНК_последовательность += "C"
-        return РНК_последовательность
+        # A -> U, T -> A, C -> G, G -> C
+        return self._перевести("ATCG", "UAGC")
 
 
 """Класс "РНК" также наследуется от класса "Последовательность"
@@ -70,6 +568,10 @@ class ДНК(Последовательность):
 последовательности и трансляция РНК в белок."""
 
 class РНК(Последовательность):
+    коды = "ACGU"
+    массы = МАССЫ_РНК
+    _поправка_массы = 159.0  # трифосфат на 5'-конце
+
     def алфавит(self):
         return "AUGC"
 
@@ -77,117 +579,527 @@ class РНК(Последовательность):
         return "РНК"
 
     def комплементарная_последовательность(self):
-        комплементарная_последовательность = ""
-        for символ in self.последовательность:
-            if символ == "A":
-                комплементарная_последовательность += "U"
-            elif символ == "U":
-                комплементарная_последовательность += "A"
-            elif символ == "G":
-                комплементарная_последовательность += "C"
-            elif символ == "C":
-                комплементарная_последовательность += "G"
-        return комплементарная_последовательность
-
-    def трансляция(self):
-        таблица_трансляции = {
-            "UUU": "Фенилаланин",
-            "UUC": "Фенилаланин",
-            "UUA": "Лейцин",
-            "UUG": "Лейцин",
-            "UCU": "Серин",
-            "UCC": "Серин",
-            "UCA": "Серин",
-            "UCG": "Серин",
-            "UAU": "Тирозин",
-            "UAC": "Тирозин",
-            "UAA": "Стоп",
-            "UAG": "Стоп",
-            "UGU": "Цистеин",
-            "UGC": "Цистеин",
-            "UGA": "Стоп",
-            "UGG": "Триптофан",
-            "CUU": "Лейцин",
-            "CUC": "Лейцин",
-            "CUA": "Лейцин",
-            "CUG": "Лейцин",
-            "CCU": "Пролин",
-            "CCC": "Пролин",
-            "CCA": "Пролин",
-            "CCG": "Пролин",
-            "CAU": "Гистидин",
-            "CAC": "Гистидин",
-            "CAA": "Глутамин",
-            "CAG": "Глутамин",
-            "CGU": "Аргинин",
-            "CGC": "Аргинин",
-            "CGA": "Аргинин",
-            "CGG": "Аргинин",
-            "AUU": "Изолейцин",
-            "AUC": "Изолейцин",
-            "AUA": "Изолейцин",
-            "AUG": "Метионин",
-            "ACU": "Треонин",
-            "ACC": "Треонин",
-            "ACA": "Треонин",
-            "ACG": "Треонин",
-            "AAU": "Аспарагин",
-            "AAC": "Аспарагин",
-            "AAA": "Лизин",
-            "AAG": "Лизин",
-            "AGU": "Серин",
-            "AGC": "Серин",
-            "AGA": "Аргинин",
-            "AGG": "Аргинин",
-            "GUU": "Валин",
-            "GUC": "Валин",
-            "GUA": "Валин",
-            "GUG": "Валин",
-            "GCU": "Аланин",
-            "GCC": "Аланин",
-            "GCA": "Аланин",
-            "GCG": "Аланин",
-            "GAU": "Аспарагиновая кислота",
-            "GAC": "Аспарагиновая кислота",
-            "GAA": "Глутаминовая кислота",
-            "GAG": "Глутаминовая кислота",
-            "GGU": "Глицин",
-            "GGC": "Глицин",
-            "GGA": "Глицин",
-            "GGG": "Глицин"
-        }
-
-        белок = ""
-        for i in range(0, len(self.последовательность), 3):
-            кодон = self.последовательность[i:i + 3]
-            if кодон in таблица_трансляции:
-                аминокислота = таблица_трансляции[кодон]
-                if аминокислота != "Стоп":
-                    белок += аминокислота + " "
-                else:
-                    break
-        return белок.strip()
-
-
-#создаю объекты и использую их методы:
-
-днк_последовательность = ДНК("ATCGTACGACGTACG")
-print(днк_последовательность.алфавит())  # ATCG
-print(днк_последовательность.название())  # ДНК
-print(днк_последовательность.последовательность)  # ATCGTACGACGTACG
-print(днк_последовательность.длина())  # 15
-print(днк_последовательность.статистика())  # {'A': 4, 'T': 4, 'C': 4, 'G': 3}
-print(днк_последовательность.молекулярная_масса())  # реализация зависит от требуемой формулы
-
-рнк_последовательность = РНК("AUCGAUCGAUCGAUCG")
-print(рнк_последовательность.алфавит())  # AUGC
-print(рнк_последовательность.название())  # РНК
-print(рнк_последовательность.последовательность)  # AUCGAUCGAUCGAUCG
-print(рнк_последовательность.длина())  # 16
-print(рнк_последовательность.статистика())  # {'A': 4, 'U': 4, 'C': 4, 'G': 4}
-print(рнк_последовательность.молекулярная_масса())  # реализация зависит от требуемой формулы
-
-print(днк_последовательность.комплементарная_последовательность())  # TAGCATGCTGCAATGC
-print(днк_последовательность.транскрипция())  # UAGCAUGCUUGCAUGC
-print(рнк_последовательность.комплементарная_последовательность())  # UAGCUAGCUAGCUAGC
-print(рнк_последовательность.трансляция())  # Изолейцин Серин Изолейцин Серин
\ No newline at end of file
+        # A <-> U, G <-> C; символы не из алфавита отбрасываются
+        return self._перевести("AUGC", "UACG")
+
+    def обратная_комплементарная_последовательность(self):
+        return self.комплементарная_последовательность()[::-1]
+
+    def трансляция(self, формат="названия"):
+        # формат: "названия" - русские названия аминокислот через пробел (как раньше),
+        # "однобуквенный" - однобуквенные коды (MKV...), "трехбуквенный" - трехбуквенные коды через дефис,
+        # "белок" - объект Белок с однобуквенной записью.
+        # Трансляция идет с начала последовательности до первого стоп-кодона;
+        # кодоны с символами не из алфавита и неполный последний кодон пропускаются.
+        белок = _транслировать_рамку(self.последовательность, 0)
+        стоп = белок.find("*")
+        if стоп != -1:
+            белок = белок[:стоп]
+        белок = белок.replace("?", "")
+        if формат == "однобуквенный":
+            return белок
+        if формат == "белок":
+            return Белок(белок)
+        if формат == "трехбуквенный":
+            return "-".join(ТРЕХБУКВЕННЫЕ_КОДЫ[буква] for буква in белок)
+        if формат == "названия":
+            return " ".join(НАЗВАНИЯ_ПО_КОДУ[буква] for буква in белок)
+        raise ValueError(f"Неизвестный формат: {формат}")
+
+    def трансляция_рамок(self):
+        # Однобуквенная трансляция всех шести рамок считывания без остановки на стоп-кодонах
+        # ("*" - стоп, "X" - кодон с символом не из алфавита). Ключи: +1, +2, +3 для прямой цепи
+        # и -1, -2, -3 для обратной комплементарной.
+        прямая = self.последовательность
+        обратная = прямая[::-1].translate(_КОМПЛЕМЕНТ_С_ДЛИНОЙ)
+        рамки = {}
+        for сдвиг in range(3):
+            рамки[сдвиг + 1] = _транслировать_рамку(прямая, сдвиг).replace("?", "X")
+            рамки[-(сдвиг + 1)] = _транслировать_рамку(обратная, сдвиг).replace("?", "X")
+        return рамки
+
+    def открытые_рамки_считывания(self, минимальная_длина=30):
+        # Поиск открытых рамок считывания (от AUG до стоп-кодона) во всех шести рамках.
+        # Возвращает список (рамка, начало, конец, белок), где [начало, конец) - участок исходной
+        # последовательности вместе со стоп-кодоном, а белок - однобуквенная запись без стопа.
+        # минимальная_длина - минимальное число аминокислот в белке.
+        длина = len(self.последовательность)
+        найденные = []
+        for рамка, белок in self.трансляция_рамок().items():
+            сдвиг = abs(рамка) - 1
+            for совпадение in re.finditer(r"M[^*]*\*", белок):
+                if совпадение.end() - совпадение.start() - 1 < минимальная_длина:
+                    continue
+                начало = сдвиг + 3 * совпадение.start()
+                конец = сдвиг + 3 * совпадение.end()
+                if рамка < 0:  # координаты на обратной цепи переводим в координаты исходной
+                    начало, конец = длина - конец, длина - начало
+                найденные.append((рамка, начало, конец, совпадение.group()[:-1]))
+        return найденные
+
+
+"""Класс "Белок" наследуется от класса "Последовательность" и хранит
+однобуквенную запись аминокислот (ее возвращает трансляция РНК с форматом "белок")."""
+
+class Белок(Последовательность):
+    массы = МАССЫ_АМИНОКИСЛОТ
+    _поправка_массы = 18.02  # молекула воды на концах цепи
+
+    def алфавит(self):
+        return "ACDEFGHIKLMNPQRSTVWY"
+
+    def название(self):
+        return "Белок"
+
+
+def молекулярные_массы(последовательности, тип=ДНК):
+    """Массы сразу для множества последовательностей (строк или объектов) типа тип.
+    Все строки склеиваются, префиксные суммы масс считаются одним проходом,
+    и масса каждой последовательности - разность сумм на ее границах."""
+    строки = [п.последовательность if isinstance(п, Последовательность) else п for п in последовательности]
+    веса = _веса_масс(тип)
+    границы = list(accumulate(map(len, строки), initial=0))
+    суммы = list(accumulate(map(веса.__getitem__, "".join(строки)), initial=0))
+    return [(суммы[конец] - суммы[начало]) / МАСШТАБ_МАСС + тип._поправка_массы if конец > начало else 0.0
+            for начало, конец in zip(границы, границы[1:])]
+
+
+"""Класс "ИндексПоиска" - FM-индекс последовательности для поиска мотивов.
+При построении один раз сортируются все суффиксы (суффиксный массив), по нему строится
+преобразование Барроуза-Уилера. Мотив длины m ищется обратным поиском за m шагов,
+каждый шаг - подсчет символа в коротком участке между контрольными точками, поэтому
+повторные запросы не просматривают последовательность заново. Индекс можно сохранить в файл."""
+
+class ИндексПоиска:
+    ШАГ_ТОЧЕК = 128  # через сколько символов преобразования запоминаются счетчики
+    _ЗАГОЛОВОК = struct.Struct("<4sBcQ4s")  # сигнатура, версия, тип SA, длина, коды
+    _СИГНАТУРА = b"FMIX"
+    _ВЕРСИЯ = 1
+
+    def __init__(self, последовательность, коды=None):
+        # последовательность - объект Последовательность или строка
+        if isinstance(последовательность, Последовательность):
+            коды = коды or последовательность.коды
+            последовательность = последовательность.последовательность
+        self.коды = коды or "ACGT"
+        # Длина текста не меняется, поэтому позиции вхождений совпадают с позициями в последовательности
+        текст = последовательность.translate(_ТАБЛИЦА_ИНДЕКСА)
+        if not текст.isascii():
+            текст = re.sub(r"[^\x00-\x7f]", "\x01", текст)
+        текст = текст.encode("ascii")
+        self.длина = len(текст)
+        self.суффиксы = array("I" if len(текст) < 1 << 32 else "Q", [len(текст)])
+        self.суффиксы.extend(self._суффиксный_массив(текст))
+        # i-й символ преобразования - символ перед i-м по порядку суффиксом (перед всем текстом - "\0")
+        дополненный = b"\0" + текст
+        self.преобразование = bytes(map(дополненный.__getitem__, self.суффиксы))
+        self._подготовить()
+
+    @staticmethod
+    def _суффиксный_массив(текст):
+        """Начала суффиксов текста в порядке возрастания суффиксов (удвоение префиксов).
+        Символы заменяются номерами 1..σ (0 - место после конца текста), и первый ключ каждого суффикса -
+        его префикс из стольких номеров, сколько помещается в 64 бита (для ДНК - 21 символ); такие ключи
+        для всех позиций сразу считает _коды_окон. Затем, пока ранги не станут различными, длина
+        префикса удваивается: новый ключ - пара рангов, сложенная в одно число.
+        Ключи и ранги хранятся в array('Q'), ранги расставляются по позициям без цикла на Python."""
+        n = len(текст)
+        if not n:
+            return []
+        символы = sorted(set(текст))
+        номера = bytearray(256)
+        for номер, символ in enumerate(символы, 1):
+            номера[символ] = номер
+        бит = len(символы).bit_length()
+        длина_префикса = 64 // бит
+        ключи = _коды_окон(текст.translate(номера) + bytes(длина_префикса - 1), длина_префикса, бит)
+        while True:
+            порядок = sorted(range(n), key=ключи.__getitem__)
+            отсортированные = array("Q", map(ключи.__getitem__, порядок))
+            # Ранг растет на 1 там, где ключ отличается от предыдущего; ранги начинаются с 1
+            новые = array("Q", accumulate(map(ne, отсортированные[1:], отсортированные), initial=1))
+            if новые[-1] == n or длина_префикса >= n:
+                return порядок
+            # Ранг каждой позиции: порядок, обратный к порядку суффиксов, тоже получается сортировкой
+            ранги = array("Q", map(новые.__getitem__, sorted(range(n), key=порядок.__getitem__)))
+            # Новый ключ: ранг префикса суффикса и ранг префикса, начинающегося через длина_префикса символов
+            следующие = ранги[длина_префикса:] + array("Q", bytes(8 * min(длина_префикса, n)))
+            ключи = array("Q", map(add, map(mul, ранги, repeat(n + 1)), следующие))
+            длина_префикса *= 2
+
+    def _подготовить(self):
+        # Число символов меньше данного (начало его участка в преобразовании)
+        # и счетчики каждого символа через каждые ШАГ_ТОЧЕК символов преобразования
+        преобразование = self.преобразование
+        шаг = self.ШАГ_ТОЧЕК
+        self._начала = {}
+        self._точки = {}
+        всего = 0
+        for символ in sorted(set(преобразование)):
+            self._начала[символ] = всего
+            всего += преобразование.count(символ)
+            self._точки[символ] = array("Q", accumulate(
+                (преобразование.count(символ, i, i + шаг) for i in range(0, len(преобразование), шаг)), initial=0))
+
+    def _встречается(self, символ, до):
+        # Сколько раз символ встречается в преобразовании до позиции до
+        точка = до // self.ШАГ_ТОЧЕК
+        return self._точки[символ][точка] + self.преобразование.count(символ, точка * self.ШАГ_ТОЧЕК, до)
+
+    def _варианты(self, буква):
+        # Символы вне ASCII и нулевой в тексте индекса заменены на \x01, поэтому с ними ничего не совпадает
+        if not буква.isascii() or буква == "\0":
+            return ""
+        буква = буква.upper()
+        if буква in "TU":
+            return self.коды[3]
+        return ВЫРОЖДЕННЫЕ_ОСНОВАНИЯ.get(буква, буква).replace("T", self.коды[3])
+
+    def _интервалы(self, мотив):
+        """Интервалы суффиксного массива, суффиксы в которых начинаются с мотива.
+        Обратный поиск: мотив перебирается с конца, для вырожденного основания
+        каждый интервал продолжается всеми его вариантами."""
+        интервалы = [(0, self.длина + 1)]
+        for буква in reversed(мотив):
+            новые = []
+            for символ in self._варианты(буква).encode("ascii"):
+                if символ not in self._начала:
+                    continue
+                начало = self._начала[символ]
+                for левый, правый in интервалы:
+                    левый = начало + self._встречается(символ, левый)
+                    правый = начало + self._встречается(символ, правый)
+                    if левый < правый:
+                        новые.append((левый, правый))
+            интервалы = новые
+            if not интервалы:
+                break
+        return интервалы
+
+    def количество(self, мотив):
+        if not мотив:
+            return 0
+        return sum(правый - левый for левый, правый in self._интервалы(мотив))
+
+    def позиции(self, мотив):
+        if not мотив:
+            return []
+        позиции = []
+        for левый, правый in self._интервалы(мотив):
+            позиции.extend(self.суффиксы[левый:правый])
+        return sorted(позиции)
+
+    def сохранить(self, путь):
+        # Заголовок, преобразование и суффиксный массив; счетчики пересчитываются при загрузке
+        with open(путь, "wb") as файл:
+            файл.write(self._ЗАГОЛОВОК.pack(self._СИГНАТУРА, self._ВЕРСИЯ, self.суффиксы.typecode.encode(),
+                                            self.длина, self.коды.encode("ascii")))
+            файл.write(self.преобразование)
+            self.суффиксы.tofile(файл)
+
+    @classmethod
+    def загрузить(cls, путь):
+        with open(путь, "rb") as файл:
+            сигнатура, версия, тип, длина, коды = cls._ЗАГОЛОВОК.unpack(файл.read(cls._ЗАГОЛОВОК.size))
+            if сигнатура != cls._СИГНАТУРА or версия != cls._ВЕРСИЯ:
+                raise ValueError(f"{путь}: это не файл индекса поиска")
+            индекс = cls.__new__(cls)
+            индекс.длина = длина
+            индекс.коды = коды.decode("ascii")
+            индекс.преобразование = файл.read(длина + 1)
+            индекс.суффиксы = array(тип.decode())
+            индекс.суффиксы.fromfile(файл, длина + 1)
+        индекс._подготовить()
+        return индекс
+
+
+"""Класс "ФайлПоследовательностей" читает записи из файлов FASTA и FASTQ.
+Файл отображается в память (mmap), а каждая запись выдается по одной в виде объекта
+ДНК или РНК, который ссылается на свой участок файла без копирования. Поэтому даже
+очень большой файл с множеством записей читается с постоянным расходом памяти.
+Для FASTA можно построить индекс (.fai, как у samtools) и получать запись по имени."""
+
+class ФайлПоследовательностей:
+    def __init__(self, путь, тип=None):
+        # тип - ДНК или РНК; если не указан, РНК выбирается для записей с U и без T
+        self.путь = путь
+        self.тип = тип
+        self._файл = open(путь, "rb")
+        self._карта = mmap.mmap(self._файл.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.path.getsize(путь) else b""
+        self._индекс = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *исключение):
+        self.close()
+
+    def close(self):
+        # mmap хранит свою копию дескриптора, поэтому файл закрывается сразу. Если еще живы записи,
+        # строка которых не собрана, или качество FASTQ, отображение закрыть нельзя (BufferError):
+        # оно освободится само, когда будет удалена последняя ссылающаяся на него запись
+        self._файл.close()
+        if isinstance(self._карта, mmap.mmap):
+            try:
+                self._карта.close()
+            except BufferError:
+                pass
+        self._карта = b""
+
+    def _запись(self, имя, начало, конец):
+        карта = self._карта
+        тип = self.тип
+        if тип is None:
+            тип = РНК if карта.find(b"U", начало, конец) != -1 and карта.find(b"T", начало, конец) == -1 else ДНК
+        return тип._из_вида(memoryview(карта)[начало:конец], имя)
+
+    def _участки_fasta(self):
+        # Для каждой записи FASTA: имя и границы ее последовательности в файле (вместе с переводами строк)
+        карта = self._карта
+        if карта[:1] == b">":
+            позиция = 0
+        else:
+            позиция = карта.find(b"\n>") + 1
+            if позиция == 0:
+                return
+        while True:
+            конец_заголовка = карта.find(b"\n", позиция)
+            if конец_заголовка == -1:
+                конец_заголовка = len(карта)
+            заголовок = bytes(карта[позиция + 1:конец_заголовка]).split(maxsplit=1)
+            имя = заголовок[0].decode() if заголовок else ""
+            следующая = карта.find(b"\n>", конец_заголовка)
+            конец = следующая + 1 if следующая != -1 else len(карта)
+            yield имя, min(конец_заголовка + 1, конец), конец
+            if следующая == -1:
+                return
+            позиция = следующая + 1
+
+    def __iter__(self):
+        if self._карта[:1] == b"@":
+            yield from self._записи_fastq()
+            return
+        for имя, начало, конец in self._участки_fasta():
+            yield self._запись(имя, начало, конец)
+
+    def _записи_fastq(self):
+        # Запись FASTQ - четыре строки: @имя, последовательность, +, качество
+        карта = self._карта
+        позиция = 0
+        while позиция < len(карта):
+            конец_заголовка = карта.find(b"\n", позиция)
+            конец_последовательности = карта.find(b"\n", конец_заголовка + 1)
+            if конец_заголовка == -1 or конец_последовательности == -1:
+                конец_последовательности = len(карта)
+            заголовок = bytes(карта[позиция + 1:конец_заголовка]).split(maxsplit=1)
+            запись = self._запись(заголовок[0].decode() if заголовок else "",
+                                  конец_заголовка + 1, конец_последовательности)
+            конец_плюса = карта.find(b"\n", конец_последовательности + 1)
+            конец_качества = карта.find(b"\n", конец_плюса + 1) if конец_плюса != -1 else -1
+            if конец_плюса != -1:
+                запись.качество = memoryview(карта)[конец_плюса + 1:
+                                                     конец_качества if конец_качества != -1 else len(карта)]
+            yield запись
+            if конец_качества == -1:
+                return
+            позиция = конец_качества + 1
+
+    def построить_индекс(self, сохранить=True):
+        # Индекс FASTA в формате .fai: имя, длина, смещение начала последовательности в файле,
+        # оснований в строке и байтов в строке (вместе с переводом строки)
+        карта = self._карта
+        индекс = {}
+        for имя, начало, конец in self._участки_fasta():
+            первый_перевод = карта.find(b"\n", начало, конец)
+            if первый_перевод == -1:
+                основания = ширина = конец - начало
+            else:
+                ширина = первый_перевод - начало + 1
+                основания = ширина - 1 - (карта[первый_перевод - 1:первый_перевод] == b"\r")
+            индекс[имя] = (self._запись(имя, начало, конец).длина(), начало, основания, ширина)
+        if сохранить:
+            with open(self.путь + ".fai", "w", encoding="utf-8") as файл:
+                for имя, поля in индекс.items():
+                    файл.write("\t".join([имя, *map(str, поля)]) + "\n")
+        self._индекс = индекс
+        return индекс
+
+    def получить(self, имя):
+        # Запись по имени через индекс: читается готовый .fai или индекс строится заново
+        if self._индекс is None:
+            путь_индекса = self.путь + ".fai"
+            if os.path.exists(путь_индекса):
+                self._индекс = {}
+                with open(путь_индекса, encoding="utf-8") as файл:
+                    for строка in файл:
+                        поля = строка.rstrip("\n").split("\t")
+                        self._индекс[поля[0]] = tuple(int(поле) for поле in поля[1:5])
+            else:
+                self.построить_индекс(сохранить=False)
+        длина, смещение, основания, ширина = self._индекс[имя]
+        полных_строк, остаток = divmod(длина, основания) if основания else (0, 0)
+        конец = смещение + полных_строк * ширина + остаток
+        return self._запись(имя, смещение, конец)
+
+
+"""Класс "ПакетПоследовательностей" хранит множество последовательностей одного типа
+(ДНК или РНК) одним буфером байтов и массивом смещений: i-я последовательность - байты
+от смещения i до смещения i + 1. Методы пакета работают сразу со всем буфером
+(translate, count по участкам через map), а не вызывают методы каждой последовательности,
+поэтому миллионы коротких прочтений обрабатываются без накладных расходов на объекты.
+Длины и статистика возвращаются столбцами: список значений для всех последовательностей.
+Символы вне Latin-1 (и нулевой символ) хранятся отдельно, как участки с неизвестными символами
+в упакованной последовательности: в буфере на их месте нулевой байт, а сами символы и их позиции
+лежат в списках исключений, поэтому исходные строки восстанавливаются без потерь."""
+
+class ПакетПоследовательностей:
+    def __init__(self, последовательности=(), тип=ДНК):
+        # последовательности - строки или объекты Последовательность
+        строки = [п.последовательность if isinstance(п, Последовательность) else п for п in последовательности]
+        self.тип = тип
+        текст = "".join(строки)
+        self._позиции_исключений = []
+        self._символы_исключений = []
+        if not текст.isascii() or "\0" in текст:
+            for совпадение in re.finditer(r"[^\x01-\xff]", текст):
+                self._позиции_исключений.append(совпадение.start())
+                self._символы_исключений.append(совпадение.group())
+            текст = re.sub(r"[^\x01-\xff]", "\0", текст)
+        self.буфер = текст.encode("latin-1")
+        self.смещения = array("Q", accumulate(map(len, строки), initial=0))
+
+    @classmethod
+    def _из_буфера(cls, буфер, смещения, тип):
+        пакет = cls.__new__(cls)
+        пакет.тип = тип
+        пакет.буфер = буфер
+        пакет.смещения = смещения
+        пакет._позиции_исключений = []
+        пакет._символы_исключений = []
+        return пакет
+
+    def _текст(self, начало, конец):
+        """Исходный текст участка буфера [начало, конец) с символами-исключениями на своих местах."""
+        текст = self.буфер[начало:конец].decode("latin-1")
+        позиции = self._позиции_исключений
+        if not позиции:
+            return текст
+        левый, правый = bisect_left(позиции, начало), bisect_left(позиции, конец)
+        if левый == правый:
+            return текст
+        символы = list(текст)
+        for позиция, символ in zip(позиции[левый:правый], self._символы_исключений[левый:правый]):
+            символы[позиция - начало] = символ
+        return "".join(символы)
+
+    @classmethod
+    def из_файла(cls, путь, тип=ДНК):
+        # Все записи файла FASTA или FASTQ одним пакетом
+        with ФайлПоследовательностей(путь, тип) as файл:
+            return cls((запись.последовательность for запись in файл), тип)
+
+    def __len__(self):
+        return len(self.смещения) - 1
+
+    def __getitem__(self, номер):
+        if номер < 0:
+            номер += len(self)
+        if not 0 <= номер < len(self):
+            raise IndexError("номер вне пакета")
+        return self.тип(self._текст(self.смещения[номер], self.смещения[номер + 1]))
+
+    def __iter__(self):
+        return map(self.тип, self.последовательности())
+
+    def последовательности(self):
+        текст = self._текст(0, len(self.буфер))
+        return list(map(текст.__getitem__, map(slice, self.смещения, self.смещения[1:])))
+
+    def длина(self):
+        return list(map(sub, self.смещения[1:], self.смещения))
+
+    def статистика(self):
+        # {символ: [количество в каждой последовательности]}: буквы алфавита в порядке кодов,
+        # затем остальные встретившиеся символы. Для каждого символа - bytes.count по всем участкам
+        прочие = set(self.буфер.translate(None, self.тип.коды.encode()).decode("latin-1"))
+        прочие.discard("\0")  # нулевые байты - места исключений, исключения считаются по своим позициям
+        исключения = set(self._символы_исключений)
+        начала, концы = self.смещения, self.смещения[1:]
+        статистика = {символ: [0] * len(self) if символ in исключения else
+                      list(map(self.буфер.count, repeat(символ.encode("latin-1")), начала, концы))
+                      for символ in self.тип.коды + "".join(sorted(прочие | исключения))}
+        for позиция, символ in zip(self._позиции_исключений, self._символы_исключений):
+            статистика[символ][bisect_right(self.смещения, позиция) - 1] += 1
+        return статистика
+
+    def _перевести(self, цель, тип):
+        """Пакет типа тип, в котором буквы алфавита заменены буквами цели, а остальные символы
+        отброшены (как в _перевести для одной последовательности); смещения пересчитываются,
+        только если что-то было отброшено."""
+        таблица, удалить = _байтовый_перевод(self.тип.коды, цель)
+        буфер = self.буфер.translate(таблица, удалить)
+        смещения = self.смещения
+        if len(буфер) != len(self.буфер):
+            статистика = self.статистика()
+            длины = map(sum, zip(*(статистика[буква] for буква in self.тип.коды)))
+            смещения = array("Q", accumulate(длины, initial=0))
+        return self._из_буфера(буфер, смещения, тип)
+
+    def комплементарная_последовательность(self):
+        # Коды упорядочены так, что комплементарные основания стоят симметрично: ACGT -> TGCA
+        return self._перевести(self.тип.коды[::-1], self.тип)
+
+    def транскрипция(self):
+        if self.тип is not ДНК:
+            raise ValueError("Транскрипция определена только для пакета ДНК")
+        return self._перевести("UGCA", РНК)
+
+    def трансляция(self, формат="названия"):
+        # Трансляция каждой РНК пакета с теми же форматами и правилами, что и РНК.трансляция.
+        # Каждая последовательность дополняется символом N до длины, кратной трем, и весь буфер
+        # транслируется за один проход: кодоны не переходят через границы, а неполные кодоны дают "?".
+        if self.тип is not РНК:
+            raise ValueError("Трансляция определена только для пакета РНК")
+        длины = self.длина()
+        дополнения = [b"N" * (-длина % 3) for длина in длины]
+        буфер = self.буфер
+        части = map(add, map(буфер.__getitem__, map(slice, self.смещения, self.смещения[1:])), дополнения)
+        белки = _транслировать_рамку(b"".join(части).decode("latin-1"), 0)
+        границы = list(accumulate(((длина + 2) // 3 for длина in длины), initial=0))
+        белки = [белки[начало:конец].partition("*")[0].replace("?", "")
+                 for начало, конец in zip(границы, границы[1:])]
+        if формат == "однобуквенный":
+            return белки
+        if формат == "трехбуквенный":
+            return ["-".join(ТРЕХБУКВЕННЫЕ_КОДЫ[буква] for буква in белок) for белок in белки]
+        if формат == "названия":
+            return [" ".join(НАЗВАНИЯ_ПО_КОДУ[буква] for буква in белок) for белок in белки]
+        if формат == "белок":
+            return [Белок(белок) for белок in белки]
+        raise ValueError(f"Неизвестный формат: {формат}")
+
+
+if __name__ == "__main__":
+    #создаю объекты и использую их методы:
+
+    днк_последовательность = ДНК("ATCGTACGACGTACG")
+    print(днк_последовательность.алфавит())  # ATCG
+    print(днк_последовательность.название())  # ДНК
+    print(днк_последовательность.последовательность)  # ATCGTACGACGTACG
+    print(днк_последовательность.длина())  # 15
+    print(днк_последовательность.статистика())  # {'A': 4, 'T': 4, 'C': 4, 'G': 3}
+    print(днк_последовательность.молекулярная_масса())  # 4577.04
+
+    рнк_последовательность = РНК("AUCGAUCGAUCGAUCG")
+    print(рнк_последовательность.алфавит())  # AUGC
+    print(рнк_последовательность.название())  # РНК
+    print(рнк_последовательность.последовательность)  # AUCGAUCGAUCGAUCG
+    print(рнк_последовательность.длина())  # 16
+    print(рнк_последовательность.статистика())  # {'A': 4, 'U': 4, 'C': 4, 'G': 4}
+    print(рнк_последовательность.молекулярная_масса())  # 5302.08
+
+    print(днк_последовательность.комплементарная_последовательность())  # TAGCATGCTGCAATGC
+    print(днк_последовательность.транскрипция())  # UAGCAUGCUUGCAUGC
+    print(рнк_последовательность.комплементарная_последовательность())  # UAGCUAGCUAGCUAGC
+    print(рнк_последовательность.трансляция())  # Изолейцин Серин Изолейцин Серин
@@ -1,11 +1,55 @@
 #2. Пользователь вводит число, программа проверяет, является ли оно простым.
+# Перебор всех делителей до num работает слишком долго для больших чисел, поэтому:
+# - маленькие простые числа один раз находим решетом Эратосфена и делим только на них;
+# - если делитель не найден, применяем тест Миллера-Рабина. С первыми 12 простыми в качестве
+#   оснований он дает точный ответ для всех чисел меньше 3.3 * 10**24 (в том числе для всех 64-битных).
+SIEVE_LIMIT = 1000
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def sieve(limit):
+    # Решето Эратосфена: is_prime_flag[i] == 1, если i простое
+    is_prime_flag = bytearray([1]) * (limit + 1)
+    is_prime_flag[0:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if is_prime_flag[i]:
+            is_prime_flag[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return [i for i in range(limit + 1) if is_prime_flag[i]]
+
+
+SMALL_PRIMES = sieve(SIEVE_LIMIT)
+
+
+def is_prime(num):
+    if num < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if num % p == 0:
+            return num == p
+    if num <= SIEVE_LIMIT * SIEVE_LIMIT:  # делителей до корня нет - число простое
+        return True
+    # Тест Миллера-Рабина: num - 1 = d * 2**s, где d нечетное
+    d, s = num - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, num)
+        if x == 1 or x == num - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % num
+            if x == num - 1:
+                break
+        else:
+            return False  # a - свидетель того, что число составное
+    return True
+
+
 num = int(input())
-flag = True
-for i in range(2, num-1):
-    if num % i == 0: #  если исходное число делится на какое-либо отличное от 1 и самого себя
-        flag = False # останавливаем цикл если встретили делитель числа
-        break
-if flag:  # эквивалентно if flag == True:
+if num < 2:
+    print('Число не является ни простым, ни составным')
+elif is_prime(num):
     print('Число простое')
 else:
     print('Число составное')
@@ -1,19 +1,118 @@
 #Пользователь вводит число, Программа возвращает простые делители введенного числа,
 # или сообщает, что оно простое.
+# Чтобы быстро раскладывать большие числа (до 18-19 цифр):
+# - простые числа до нужной границы хранятся в кэше, который дополняется
+#   сегментированным решетом Эратосфена (решето строится кусками фиксированного размера);
+# - сначала число делится на простые из кэша;
+# - оставшийся большой множитель проверяется тестом Миллера-Рабина и,
+#   если он составной, раскладывается ро-методом Полларда (вариант Брента).
+import math
+import random
+
+SEGMENT_SIZE = 1 << 15  # размер одного куска решета
+TRIAL_LIMIT = 1 << 16  # до какой границы делим на простые из кэша
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+primes_cache = [2, 3, 5, 7]  # уже найденные простые числа
+sieved_up_to = 10  # кэш содержит все простые числа меньше этой границы
+
+
+def primes_up_to(limit):
+    # Возвращает список всех простых чисел меньше limit, достраивая кэш по кускам
+    global sieved_up_to
+    while sieved_up_to < limit:
+        low = sieved_up_to
+        # Для просеивания куска нужны простые до корня из его правой границы,
+        # поэтому кусок не выходит за low**2: все такие простые уже есть в кэше
+        high = min(low + SEGMENT_SIZE, low * low)
+        root = math.isqrt(high - 1)
+        segment = bytearray([1]) * (high - low)  # segment[i] == 1, если low + i простое
+        for p in primes_cache:
+            if p > root:
+                break
+            start = max(p * p, (low + p - 1) // p * p)
+            segment[start - low::p] = bytes(len(range(start, high, p)))
+        primes_cache.extend(low + i for i, flag in enumerate(segment) if flag)
+        sieved_up_to = high
+    return primes_cache if primes_cache[-1] < limit else [p for p in primes_cache if p < limit]
+
+
+def is_prime(n):
+    if n < 2:
+        return False
+    for p in primes_up_to(100):
+        if n % p == 0:
+            return n == p
+    # Тест Миллера-Рабина с фиксированными основаниями точен для всех n < 3.3 * 10**24
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n):
+    # Ищет нетривиальный делитель составного числа n (ро-метод Полларда в варианте Брента).
+    # Произведения разностей копятся блоками по m штук, чтобы реже вычислять НОД.
+    if n % 2 == 0:
+        return 2
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:  # блок "перескочил" делитель - повторяем шаги по одному
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        # неудачная последовательность - пробуем другие y и c
+
+
 def prime_factors(n):
     # Создаем пустой список для хранения простых делителей
     factors = []
-    # Ищем делитель от 2 до корня из числа
-    while n > 1:
-        for i in range(2, int(n**0.5) + 1):
-            if n % i == 0:
-                factors.append(i)
-                n //= i
-                break
-        else:
-            # Если нет делителей от 2 до корня из числа, оно простое
-            factors.append(n)
+    # Сначала делим на маленькие простые числа из кэша
+    for p in primes_up_to(TRIAL_LIMIT):
+        if p * p > n:
             break
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+    if n > 1:
+        # Оставшаяся часть не имеет делителей меньше TRIAL_LIMIT; раскладываем ее ро-методом
+        stack = [n]
+        while stack:
+            m = stack.pop()
+            if m < TRIAL_LIMIT * TRIAL_LIMIT or is_prime(m):
+                factors.append(m)  # у m нет маленьких делителей, а значит m простое
+            else:
+                d = pollard_rho(m)
+                stack += [d, m // d]
+    factors.sort()
     return factors
 
 # Получаем число от пользователя
@@ -1,10 +1,72 @@
 #4. Программа находит наибольший общий делитель для двух введенных чисел.
-#Делала через алгоритм Эвклида, из большего значения постоянно вычитаем меньшее, пока они не станут равны
+#Раньше делала через алгоритм Эвклида с вычитанием: из большего значения постоянно вычитаем меньшее,
+#пока они не станут равны. Но для gcd(10**12, 1) это 10**12 вычитаний, а если одно из чисел 0 -
+#цикл вообще не заканчивается. Поэтому вычитания заменены взятием остатка.
+import math
+from functools import reduce
+
+
+def gcd(a, b):
+    # Алгоритм Эвклида с остатком: НОД(a, b) = НОД(b, a % b), НОД(a, 0) = a
+    a, b = abs(a), abs(b)
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def binary_gcd(a, b):
+    # Бинарный алгоритм (Стейна): вместо деления - сдвиги и вычитания
+    a, b = abs(a), abs(b)
+    if a == 0 or b == 0:
+        return a | b
+    shift = ((a | b) & -(a | b)).bit_length() - 1  # общая степень двойки
+    a >>= (a & -a).bit_length() - 1
+    while b:
+        b >>= (b & -b).bit_length() - 1  # убираем множители 2 из b
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+def extended_gcd(a, b):
+    # Расширенный алгоритм Эвклида: возвращает (d, x, y), где d = НОД(a, b) и a*x + b*y = d
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_x, x = x, old_x - q * x
+        old_y, y = y, old_y - q * y
+    if old_r < 0:
+        old_r, old_x, old_y = -old_r, -old_x, -old_y
+    return old_r, old_x, old_y
+
+
+def lcm(a, b):
+    # Наименьшее общее кратное через НОД: НОК(a, b) = |a * b| / НОД(a, b)
+    if a == 0 or b == 0:
+        return 0
+    return abs(a // gcd(a, b) * b)
+
+
+def gcd_pairs(pairs_a, pairs_b):
+    # НОД для каждой пары (pairs_a[i], pairs_b[i]) за один проход.
+    # math.gcd написан на C, поэтому map по миллионам пар работает без цикла на Python
+    return list(map(math.gcd, pairs_a, pairs_b))
+
+
+def gcd_all(numbers):
+    # НОД всего списка чисел
+    return reduce(math.gcd, numbers, 0)
+
+
+def lcm_all(numbers):
+    # НОК всего списка чисел
+    return reduce(lcm, numbers, 1)
+
+
 a = int(input())
 b = int(input())
-while a != b:
-    if a>=b:
-        a-=b
-    else:
-        b-=a
-print(a)
\ No newline at end of file
+print(gcd(a, b))
@@ -1,9 +1,17 @@
 import string
+import sys
+
+_tables = {}
+
+
+def _table(case):
+    if case not in _tables:
+        _tables[case] = case.maketrans(case, case.swapcase())
+    return _tables[case]
+
+
 def up(word, case = string.ascii_lowercase):
-    result = ''
-    for letter in word:
-        result += letter.swapcase() if letter in case else letter
-    return result
+    return word.translate(_table(case))
 
 def down(word):
     return up(word, string.ascii_uppercase)
@@ -11,5 +19,20 @@ def down(word):
 def mirr(word):
     return up(word, string.ascii_letters)
 
-str = input()
-print(up(str), down(str), mirr(str), sep='\n')
+
+def convert_stream(src, dst, convert, chunk_size=1 << 20):
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        dst.write(convert(chunk))
+
+
+if len(sys.argv) > 1:
+    modes = {'up': up, 'down': down, 'mirr': mirr}
+    if sys.argv[1] not in modes:
+        sys.exit(f"Использование: python {sys.argv[0]} {{up|down|mirr}} < input > output")
+    convert_stream(sys.stdin, sys.stdout, modes[sys.argv[1]])
+else:
+    line = input()
+    print(up(line), down(line), mirr(line), sep='\n')
@@ -5,17 +5,45 @@
 #Добавить к предыдущему заданию функцию с преобразованием всех символов в прописные
 # и функцию с отражением (все заглавные становятся прописными и наоборот), минимально дублируя код.
 # Использовать функции стандартной библиотеки lower() и find() нельзя.
+#Посимвольная сборка строки через result += ... и проверка letter in case (поиск по строке) работают медленно,
+#поэтому для каждого набора символов один раз строится таблица перевода, и строка преобразуется методом translate.
+#Буквы не из набора case (в том числе не латинские) остаются без изменений, как и раньше.
 import string
+import sys
+
+_tables = {}#таблицы перевода, уже построенные для каждого набора символов case
+
+
+def _table(case):#таблица перевода: каждая буква из case заменяется буквой другого регистра
+    if case not in _tables:
+        _tables[case] = case.maketrans(case, case.swapcase())
+    return _tables[case]
+
+
 def up(word, case = string.ascii_lowercase):#word необходимо преобразовать в верхний регистр, а case определяет символы которые строчные
-    result = ''
-    for letter in word: #цикл перебирает каждый символ в слове и проверяет находится ли он в case
-        result += letter.swapcase() if letter in case else letter
-    return result
+    return word.translate(_table(case))#translate заменяет все символы за один проход
 def down(word):
     return up(word, string.ascii_uppercase)
 
 def mirr(word):
     return up(word, string.ascii_letters)
 
-str = input()
-print(up(str), down(str), mirr(str), sep='\n')
\ No newline at end of file
+
+def convert_stream(src, dst, convert, chunk_size=1 << 20):#потоковое преобразование больших файлов кусками фиксированного размера
+    while True:                                          #в памяти одновременно находится только один кусок
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        dst.write(convert(chunk))#каждый символ преобразуется независимо, поэтому границы кусков не важны
+
+
+#Запуск с аргументом up, down или mirr преобразует stdin в stdout потоком, например:
+#python "Задача 2.1,2 с пояснением.py" up < input.log > output.log
+if len(sys.argv) > 1:
+    modes = {'up': up, 'down': down, 'mirr': mirr}
+    if sys.argv[1] not in modes:#неизвестный режим: вместо KeyError печатается подсказка, и программа завершается с ошибкой
+        sys.exit(f"Использование: python {sys.argv[0]} {{up|down|mirr}} < input > output")
+    convert_stream(sys.stdin, sys.stdout, modes[sys.argv[1]])
+else:
+    line = input()#переменная не называется str, чтобы не закрывать встроенный тип str
+    print(up(line), down(line), mirr(line), sep='\n')
\ No newline at end of file
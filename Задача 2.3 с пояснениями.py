@@ -7,14 +7,21 @@ base = int(input("Введите основание системы счисле
 num1 = input("Введите первое число: ")#Запрашиваю первое число в заданной системе счисления
 num2 = input("Введите второе число: ")#Запрашиваю второе число в заданной системе счисления
 new_base = int(input("Введите основание системы счисления для вывода: "))#Запрашиваю основание системы счисления, в которой будет выведен результат
-dec1 = int(num1, base)#Перевожу числа из заданной системы счисления в десятичную
-dec2 = int(num2, base)
+digits = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"#Цифры систем счисления до 36: после 9 идут буквы
+def to_decimal(num, base):#Перевожу число из заданной системы счисления в десятичную без функции int()
+    result = 0
+    for symbol in num.upper():
+        result = result * base + digits.index(symbol)#схема Горнера: сдвигаем число на разряд и добавляем цифру
+    return result
+dec1 = to_decimal(num1, base)
+dec2 = to_decimal(num2, base)
 result_dec = dec1 + dec2#Складываю числа в десятичной системе счисления
-result_new_base = ""#Перевожу результат в заданную систему счисления т.е. # переменная счетчик в которую будем записывать остатки от деления
+remainders = []#Перевожу результат в заданную систему счисления: записываю остатки от деления в список
 while result_dec > 0:
     digit = result_dec % new_base
-    result_new_base = str(digit) + result_new_base
+    remainders.append(digits[digit])#остаток больше 9 записывается буквой, а не несколькими цифрами
     result_dec = result_dec // new_base
+result_new_base = "".join(reversed(remainders)) or "0"#остатки получаются с конца, поэтому разворачиваю список
 print("Результат суммирования:", result_new_base)
 
 """ Пример упрощенной программы: На вход программе подается натуральное число, 
@@ -1,13 +1,282 @@
-base = int(input("Введите основание системы счисления: "))#Запрашиваю у пользователя основание системы счисления
-num1 = input("Введите первое число: ")#Запрашиваю первое число в заданной системе счисления
-num2 = input("Введите второе число: ")#Запрашиваю второе число в заданной системе счисления
-new_base = int(input("Введите основание системы счисления для вывода: "))#Запрашиваю основание системы счисления, в которой будет выведен результат
-dec1 = int(num1, base)#Перевожу числа из заданной системы счисления в десятичную
-dec2 = int(num2, base)
-result_dec = dec1 + dec2#Складываю числа в десятичной системе счисления
-result_new_base = ""#Перевожу результат обратно в заданную систему счисления
-while result_dec > 0:
-    digit = result_dec % new_base
-    result_new_base = str(digit) + result_new_base
-    result_dec = result_dec // new_base
-print("Результат суммирования:", result_new_base)
\ No newline at end of file
+# Сложение двух чисел в системе счисления с основанием base и вывод результата в системе new_base.
+# Функцию int() для перевода использовать нельзя, поэтому перевод сделан вручную:
+# - поддерживаются основания от 2 до 36 (цифры 0-9, затем буквы A-Z) и свои алфавиты цифр;
+# - длинные числа переводятся методом "разделяй и властвуй": строка делится пополам,
+#   и число собирается как left * base**len(right) + right (и наоборот при выводе),
+#   поэтому время растет почти как время умножения, а не квадратично от количества цифр;
+# - остатки собираются в список и склеиваются один раз, а не прибавляются к строке по одному.
+# Кроме того, числа можно складывать, вычитать и умножать прямо в их системе счисления,
+# работая со списками цифр (младшая цифра - первая). Если основание результата совпадает
+# с основанием слагаемых, перевод вообще не нужен, а если нет - переводится только сумма.
+import string
+
+DIGITS = string.digits + string.ascii_uppercase  # алфавит цифр по умолчанию
+SMALL = 32  # число цифр, начиная с которого выгодно делить строку пополам
+
+
+def _digit_values(base, alphabet):
+    # Словарь "символ цифры -> значение"; для стандартного алфавита регистр букв не важен
+    if not 2 <= base <= len(alphabet):
+        raise ValueError(f"Основание должно быть от 2 до {len(alphabet)}")
+    values = {symbol: value for value, symbol in enumerate(alphabet[:base])}
+    if alphabet is DIGITS:
+        values.update({symbol.lower(): value for symbol, value in list(values.items())})
+    return values
+
+
+def _parse_digits(text, base, values, powers):
+    # Перевод строки цифр без знака в число: короткие строки - схемой Горнера, длинные - делением пополам
+    if len(text) <= SMALL:
+        result = 0
+        for symbol in text:
+            digit = values.get(symbol)
+            if digit is None:
+                raise ValueError(f"Недопустимая цифра {symbol!r} для основания {base}")
+            result = result * base + digit
+        return result
+    half = len(text) // 2
+    low_len = len(text) - half
+    if low_len not in powers:
+        powers[low_len] = base ** low_len
+    return (_parse_digits(text[:half], base, values, powers) * powers[low_len]
+            + _parse_digits(text[half:], base, values, powers))
+
+
+def parse_number(text, base, alphabet=DIGITS, _powers=None):
+    # Переводит строку text из системы с основанием base в число (int() не используется)
+    text = text.strip()
+    sign = 1
+    if text[:1] in ('-', '+'):
+        sign = -1 if text[0] == '-' else 1
+        text = text[1:]
+    if not text:
+        raise ValueError("Пустая запись числа")
+    return sign * _parse_digits(text, base, _digit_values(base, alphabet), {} if _powers is None else _powers)
+
+
+def parse_stream(chunks, base, alphabet=DIGITS):
+    # Потоковый перевод: chunks - куски записи одного числа (например, строки файла).
+    # Каждый кусок переводится отдельно и приписывается справа к уже прочитанной части.
+    values = _digit_values(base, alphabet)
+    powers = {}
+    result = 0
+    for chunk in chunks:
+        chunk = ''.join(chunk.split())  # пробелы и переводы строк внутри записи игнорируются
+        if chunk:
+            if len(chunk) not in powers:
+                powers[len(chunk)] = base ** len(chunk)
+            result = result * powers[len(chunk)] + _parse_digits(chunk, base, values, powers)
+    return result
+
+
+def _base_powers(number, base):
+    # Степени base**(2**k), пока они не превысят число
+    powers = [base]
+    while powers[-1] * powers[-1] <= number:
+        powers.append(powers[-1] * powers[-1])
+    return powers
+
+
+def _to_digits(number, base, alphabet, powers, level, width, out):
+    # Дописывает в out цифры числа number < powers[level]**2 (в нем меньше 2**(level+1) цифр);
+    # width - сколько цифр должно получиться с ведущими нулями (0 - без ведущих нулей)
+    if (1 << level) <= SMALL // 2:
+        digits = []
+        while number:
+            number, digit = divmod(number, base)
+            digits.append(alphabet[digit])
+        digits.extend(alphabet[0] * (width - len(digits)))
+        out.extend(reversed(digits))
+        return
+    high, low = divmod(number, powers[level])
+    low_width = 1 << level  # младшая часть - ровно 2**level цифр
+    if high or width > low_width:
+        _to_digits(high, base, alphabet, powers, level - 1, max(width - low_width, 0), out)
+        _to_digits(low, base, alphabet, powers, level - 1, low_width, out)
+    else:
+        _to_digits(low, base, alphabet, powers, level - 1, width, out)
+
+
+def to_base(number, base, alphabet=DIGITS, _powers=None):
+    # Переводит число в строку в системе с основанием base
+    if not 2 <= base <= len(alphabet):
+        raise ValueError(f"Основание должно быть от 2 до {len(alphabet)}")
+    if number == 0:
+        return alphabet[0]
+    sign = '-' if number < 0 else ''
+    number = abs(number)
+    powers = _powers if _powers is not None else _base_powers(number, base)  # в пакетном режиме степени общие
+    out = []
+    _to_digits(number, base, alphabet, powers, len(powers) - 1, 0, out)
+    return sign + ''.join(out)
+
+
+def to_base_many(numbers, base, alphabet=DIGITS):
+    # Пакетный перевод: степени основания вычисляются один раз для самого большого числа
+    numbers = list(numbers)
+    powers = _base_powers(max((abs(n) for n in numbers), default=0), base)
+    return [to_base(n, base, alphabet, powers) for n in numbers]
+
+
+def parse_many(texts, base, alphabet=DIGITS):
+    # Пакетный разбор: таблица цифр и степени основания общие для всех строк
+    powers = {}
+    return [parse_number(text, base, alphabet, powers) for text in texts]
+
+
+def to_digit_list(text, base, alphabet=DIGITS):
+    # Строка цифр -> список значений цифр, начиная с младшей
+    values = _digit_values(base, alphabet)
+    try:
+        digits = [values[symbol] for symbol in reversed(text.strip())]
+    except KeyError as error:
+        raise ValueError(f"Недопустимая цифра {error.args[0]!r} для основания {base}") from None
+    return _trim(digits)
+
+
+def from_digit_list(digits, alphabet=DIGITS):
+    # Список цифр (младшая - первая) -> строка
+    if not digits:
+        return alphabet[0]
+    return ''.join(alphabet[digit] for digit in reversed(digits))
+
+
+def _trim(digits):
+    # Убирает ведущие нули (они в конце списка); ноль - пустой список
+    while digits and digits[-1] == 0:
+        digits.pop()
+    return digits
+
+
+def add_digits(a, b, base):
+    # Сложение столбиком
+    if len(a) < len(b):
+        a, b = b, a
+    result = []
+    carry = 0
+    for i, digit in enumerate(a):
+        carry += digit + (b[i] if i < len(b) else 0)
+        if carry >= base:
+            result.append(carry - base)
+            carry = 1
+        else:
+            result.append(carry)
+            carry = 0
+    if carry:
+        result.append(carry)
+    return result
+
+
+def compare_digits(a, b):
+    # Сравнение чисел: -1, 0 или 1
+    if len(a) != len(b):
+        return -1 if len(a) < len(b) else 1
+    for x, y in zip(reversed(a), reversed(b)):
+        if x != y:
+            return -1 if x < y else 1
+    return 0
+
+
+def subtract_digits(a, b, base):
+    # Вычитание столбиком, уменьшаемое не должно быть меньше вычитаемого
+    if compare_digits(a, b) < 0:
+        raise ValueError("Вычитаемое больше уменьшаемого")
+    result = []
+    borrow = 0
+    for i, digit in enumerate(a):
+        digit -= borrow + (b[i] if i < len(b) else 0)
+        if digit < 0:
+            result.append(digit + base)
+            borrow = 1
+        else:
+            result.append(digit)
+            borrow = 0
+    return _trim(result)
+
+
+def _karatsuba(a, b):
+    # Умножение многочленов (списков коэффициентов) методом Карацубы, без переносов.
+    # Коэффициенты результата могут быть больше основания - переносы делаются в конце один раз
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) <= SMALL:
+        result = [0] * (len(a) + len(b) - 1) if b else []
+        for j, y in enumerate(b):
+            if y:
+                for i, x in enumerate(a):
+                    result[i + j] += x * y
+        return result
+    half = len(a) // 2
+    a0, a1 = a[:half], a[half:]
+    b0, b1 = b[:half], b[half:]
+    z0 = _karatsuba(a0, b0)
+    z2 = _karatsuba(a1, b1)
+    a_sum = [x + (a1[i] if i < len(a1) else 0) for i, x in enumerate(a0)] + a1[len(a0):]
+    b_sum = [x + (b1[i] if i < len(b1) else 0) for i, x in enumerate(b0)] + b1[len(b0):]
+    z1 = _karatsuba(a_sum, b_sum)
+    for i, value in enumerate(z0):
+        z1[i] -= value
+    for i, value in enumerate(z2):
+        z1[i] -= value
+    result = [0] * (len(a) + len(b) - 1)
+    for i, value in enumerate(z0):
+        result[i] += value
+    for i, value in enumerate(z1):
+        if value:
+            result[i + half] += value
+    for i, value in enumerate(z2):
+        result[i + 2 * half] += value
+    return result
+
+
+def multiply_digits(a, b, base):
+    # Умножение в системе с основанием base: Карацуба для коэффициентов, затем переносы
+    if not a or not b:
+        return []
+    result = []
+    carry = 0
+    for value in _karatsuba(a, b):
+        carry, digit = divmod(value + carry, base)
+        result.append(digit)
+    while carry:
+        carry, digit = divmod(carry, base)
+        result.append(digit)
+    return _trim(result)
+
+
+def _signed_digit_list(text, base, alphabet=DIGITS):
+    # Запись со знаком, как в parse_number -> (знак, список цифр)
+    text = text.strip()
+    sign = 1
+    if text[:1] in ('-', '+'):
+        sign = -1 if text[0] == '-' else 1
+        text = text[1:]
+    if not text:
+        raise ValueError("Пустая запись числа")
+    return sign, to_digit_list(text, base, alphabet)
+
+
+def add_numbers(num1, num2, base, new_base, alphabet=DIGITS):
+    # Сумма двух записей в системе base, выведенная в системе new_base.
+    # Складываем прямо в системе base; если new_base другое, переводим только результат.
+    # При разных знаках из большего по модулю числа вычитается меньшее, знак берется у большего
+    sign1, digits1 = _signed_digit_list(num1, base, alphabet)
+    sign2, digits2 = _signed_digit_list(num2, base, alphabet)
+    if sign1 == sign2:
+        sign, total = sign1, add_digits(digits1, digits2, base)
+    elif compare_digits(digits1, digits2) >= 0:
+        sign, total = sign1, subtract_digits(digits1, digits2, base)
+    else:
+        sign, total = sign2, subtract_digits(digits2, digits1, base)
+    result = ('-' if sign < 0 and total else '') + from_digit_list(total, alphabet)
+    if new_base == base:
+        return result
+    return to_base(parse_number(result, base, alphabet), new_base, alphabet)
+
+
+if __name__ == "__main__":
+    base = int(input("Введите основание системы счисления: "))#Запрашиваю у пользователя основание системы счисления
+    num1 = input("Введите первое число: ")#Запрашиваю первое число в заданной системе счисления
+    num2 = input("Введите второе число: ")#Запрашиваю второе число в заданной системе счисления
+    new_base = int(input("Введите основание системы счисления для вывода: "))#Запрашиваю основание системы счисления, в которой будет выведен результат
+    print("Результат суммирования:", add_numbers(num1, num2, base, new_base))#Складываю в исходной системе и перевожу только сумму